@@ -1,6 +1,6 @@
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from functools import lru_cache
+from functools import cached_property, lru_cache
 
 # Path to project root (parent of backend directory)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -12,17 +12,27 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_anon_key: str
     supabase_service_key: str
+    # JWT secret (Settings > API) for verifying access tokens locally; empty = ask Supabase
+    supabase_jwt_secret: str = ""
     debug: bool = False
     
+    # Seconds a validated access token is trusted before re-checking with Supabase
+    auth_cache_ttl: int = 5
+    
     # Comma-separated list of allowed emails (empty = allow all)
     allowed_emails: str = ""
     
+    @cached_property
+    def allowed_email_set(self) -> frozenset[str]:
+        """Normalized whitelist, parsed once per settings instance."""
+        return frozenset(
+            e.strip().lower() for e in self.allowed_emails.split(",") if e.strip()
+        )
+    
     def is_email_allowed(self, email: str) -> bool:
         """Check if email is in the whitelist (or whitelist is disabled)."""
-        if not self.allowed_emails:
-            return True  # No whitelist = allow all
-        allowed = [e.strip().lower() for e in self.allowed_emails.split(",")]
-        return email.lower() in allowed
+        allowed = self.allowed_email_set
+        return not allowed or email.lower() in allowed  # No whitelist = allow all
 
     model_config = SettingsConfigDict(
         env_file=str(PROJECT_ROOT / ".env"),
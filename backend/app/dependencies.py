@@ -1,59 +1,97 @@
 """FastAPI dependencies for auth and database access."""
 
+import hashlib
+import time
 from typing import Annotated
-from functools import lru_cache
-from fastapi import Depends, HTTPException, status
+import httpx
+import jwt
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from supabase import create_client, Client
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
 from gotrue.types import User
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
 
 from .config import Settings, get_settings
+from .services.loaders import BatchLoader
 
 # HTTP Bearer token extractor
 security = HTTPBearer()
 
+# Validated tokens: sha256(token) -> (user, expires_at)
+_user_cache: TTLCache[bytes, tuple[User, float]] = TTLCache(maxsize=10_000, ttl=300)
+# Locally verified tokens, kept apart because these users only carry token claims
+_claims_user_cache: TTLCache[bytes, tuple[User, float]] = TTLCache(maxsize=10_000, ttl=300)
 
-def is_user_admin(user: User) -> bool:
-    """Check if a user has admin privileges."""
-    user_metadata = user.user_metadata or {}
-    return user_metadata.get("is_admin", False) is True
 
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client shared by all Supabase clients."""
+    return httpx.AsyncClient(
+        # Concurrent queries from one request share a connection
+        http2=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=20, max_connections=100, keepalive_expiry=30
+        ),
+        # Keep postgrest-py's own timeout; httpx's 5s default would cut off
+        # slow RPCs such as bulk benefit inserts
+        timeout=httpx.Timeout(DEFAULT_POSTGREST_CLIENT_TIMEOUT),
+    )
 
-@lru_cache
-def _get_supabase_client(url: str, key: str) -> Client:
-    """Create and cache a Supabase client instance."""
-    return create_client(url, key)
 
+async def create_supabase_client(
+    url: str, key: str, http_client: httpx.AsyncClient
+) -> AsyncClient:
+    """Create a Supabase client on top of the shared HTTP connection pool."""
+    return await acreate_client(url, key, options=AsyncClientOptions(httpx_client=http_client))
 
-def get_supabase_client(
-    settings: Annotated[Settings, Depends(get_settings)],
-) -> Client:
-    """Get cached Supabase client instance (anon key)."""
-    return _get_supabase_client(settings.supabase_url, settings.supabase_anon_key)
 
+async def get_supabase_client(request: Request) -> AsyncClient:
+    """Get the shared Supabase client instance (anon key)."""
+    return request.app.state.supabase
 
-def get_supabase_admin_client(
-    settings: Annotated[Settings, Depends(get_settings)],
-) -> Client:
-    """Get cached Supabase admin client (service key for privileged operations)."""
-    return _get_supabase_client(settings.supabase_url, settings.supabase_service_key)
 
+async def get_supabase_admin_client(request: Request) -> AsyncClient:
+    """Get the shared Supabase admin client (service key for privileged operations)."""
+    return request.app.state.supabase_admin
 
-async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    settings: Annotated[Settings, Depends(get_settings)],
-) -> User:
+
+async def get_benefits_loader(request: Request) -> BatchLoader[str, list[dict]]:
+    """Get the shared loader that batches benefit lookups by card_id."""
+    return request.app.state.benefits_loader
+
+
+async def get_preferences_loader(request: Request) -> BatchLoader[str, list[dict]]:
+    """Get the shared loader that batches benefit preference lookups by user_card_id."""
+    return request.app.state.preferences_loader
+
+
+async def _fetch_user(token: str, settings: Settings, supabase: AsyncClient) -> User:
     """
-    Validate JWT token and return current user.
+    Validate a token with Supabase Auth and return the full user record.
     
-    Extracts the Bearer token from Authorization header,
-    validates it with Supabase, and returns the User object.
+    Validated tokens are cached briefly (``auth_cache_ttl``).
     """
-    token = credentials.credentials
+    now = time.time()
+    
+    # Repeat requests with the same token skip the Supabase round-trip
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _user_cache.get(cache_key)
+    if cached is not None and cached[1] > now:
+        return cached[0]
     
     try:
-        supabase = _get_supabase_client(settings.supabase_url, settings.supabase_anon_key)
-        user_response = supabase.auth.get_user(token)
+        # Reject expired or malformed tokens without a network call;
+        # the signature itself is still verified by Supabase below
+        claims = jwt.decode(token, options={"verify_signature": False})
+        token_exp = float(claims.get("exp", 0))
+        if token_exp <= now:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        user_response = await supabase.auth.get_user(token)
         
         if user_response.user is None:
             raise HTTPException(
@@ -62,6 +100,7 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        _user_cache[cache_key] = (user_response.user, min(token_exp, now + settings.auth_cache_ttl))
         return user_response.user
         
     except HTTPException:
@@ -74,6 +113,90 @@ async def get_current_user(
         ) from e
 
 
+def _user_from_claims(claims: dict) -> User:
+    """
+    Build a User from verified access token claims.
+    
+    Only the fields carried in the token are set; timestamps such as
+    created_at are not available without asking Supabase.
+    """
+    return User.model_construct(
+        id=claims["sub"],
+        aud=claims["aud"],
+        email=claims.get("email"),
+        phone=claims.get("phone"),
+        role=claims.get("role"),
+        app_metadata=claims.get("app_metadata") or {},
+        user_metadata=claims.get("user_metadata") or {},
+    )
+
+
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_client)],
+) -> User:
+    """
+    Validate JWT token and return current user.
+    
+    Extracts the Bearer token from Authorization header and verifies it
+    locally against the project's JWT secret when one is configured.
+    Otherwise (or for non-HS256 tokens) the token is validated with Supabase.
+    """
+    token = credentials.credentials
+    
+    if not settings.supabase_jwt_secret:
+        return await _fetch_user(token, settings, supabase)
+    
+    # Repeat requests with the same token skip decoding and verification
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _claims_user_cache.get(cache_key)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+    
+    try:
+        if jwt.get_unverified_header(token).get("alg") != "HS256":
+            return await _fetch_user(token, settings, supabase)
+        
+        claims = jwt.decode(
+            token,
+            settings.supabase_jwt_secret,
+            algorithms=["HS256"],
+            audience="authenticated",
+            options={"require": ["exp", "sub"]},
+        )
+        user = _user_from_claims(claims)
+        _claims_user_cache[cache_key] = (user, float(claims["exp"]))
+        return user
+        
+    except jwt.ExpiredSignatureError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+    except jwt.InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+
+
+async def get_current_user_profile(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_client)],
+) -> User:
+    """
+    Validate JWT token and return the full user record from Supabase.
+    
+    Use this instead of get_current_user when fields that are not part
+    of the token (created_at, updated_at) are needed.
+    """
+    return await _fetch_user(credentials.credentials, settings, supabase)
+
+
 async def require_admin(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
@@ -82,7 +205,9 @@ async def require_admin(
     
     Use this as a dependency for admin-only endpoints.
     """
-    if not is_user_admin(current_user):
+    # app_metadata can only be set by the service role, unlike user_metadata
+    meta = current_user.app_metadata
+    if not (meta and meta.get("is_admin") is True):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required",
@@ -1,23 +1,58 @@
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
 from pathlib import Path
+import httpx
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
 from .config import get_settings
+from .dependencies import create_http_client, create_supabase_client
+from .services.loaders import create_benefits_by_card_loader, create_preferences_by_user_card_loader
 from .routers import auth, cards, admin
 
 # Get settings
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the Supabase clients once per process and share their connection pool."""
+    http_client = create_http_client()
+    app.state.supabase = await create_supabase_client(
+        settings.supabase_url, settings.supabase_anon_key, http_client
+    )
+    app.state.supabase_admin = await create_supabase_client(
+        settings.supabase_url, settings.supabase_service_key, http_client
+    )
+    # Loaders are shared so concurrent requests in the same tick share a query
+    app.state.benefits_loader = create_benefits_by_card_loader(app.state.supabase_admin)
+    app.state.preferences_loader = create_preferences_by_user_card_loader(app.state.supabase_admin)
+    # Open a connection to Supabase up front so the first request skips the
+    # TCP/TLS handshake; startup must not fail if Supabase is unreachable
+    with suppress(httpx.HTTPError):
+        await http_client.get(
+            f"{settings.supabase_url.rstrip('/')}/rest/v1/",
+            headers={"apikey": settings.supabase_anon_key},
+        )
+    yield
+    await http_client.aclose()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Cards API",
     description="FastAPI backend with Supabase authentication",
     version="0.1.0",
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
+# Compress larger JSON and static responses; small ones aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Configure CORS for development
 app.add_middleware(
     CORSMiddleware,
@@ -26,8 +61,8 @@ app.add_middleware(
         "http://127.0.0.1:5173",
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Include routers
@@ -38,13 +73,34 @@ app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 # Path to frontend build directory
 FRONTEND_BUILD_DIR = Path(__file__).parent.parent.parent / "frontend" / "dist"
 
+# The build directory doesn't change for the lifetime of the process
+FRONTEND_BUILT = FRONTEND_BUILD_DIR.exists()
+INDEX_PATH = FRONTEND_BUILD_DIR / "index.html"
+INDEX_EXISTS = INDEX_PATH.exists()
+
+
+@lru_cache(maxsize=1024)
+def _frontend_file(full_path: str) -> Path | None:
+    """Resolve a request path to a file in the frontend build, if one exists."""
+    file_path = FRONTEND_BUILD_DIR / full_path
+    return file_path if file_path.is_file() else None
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files served with far-future caching (Vite content-hashes asset names)."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 
 # Mount static files if frontend build exists (production)
-if FRONTEND_BUILD_DIR.exists():
+if FRONTEND_BUILT:
     # Mount assets directory for JS, CSS, images
     assets_dir = FRONTEND_BUILD_DIR / "assets"
     if assets_dir.exists():
-        app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+        app.mount("/assets", ImmutableStaticFiles(directory=str(assets_dir)), name="assets")
 
 
 @app.get("/api/health")
@@ -66,15 +122,14 @@ async def serve_spa(request: Request, full_path: str):
         return {"detail": "Not Found"}
     
     # Check if requesting a static file
-    if FRONTEND_BUILD_DIR.exists():
+    if FRONTEND_BUILT:
         # Try to serve the requested file
-        file_path = FRONTEND_BUILD_DIR / full_path
-        if file_path.is_file():
+        file_path = _frontend_file(full_path)
+        if file_path is not None:
             return FileResponse(file_path)
         
         # Otherwise serve index.html for client-side routing
-        index_path = FRONTEND_BUILD_DIR / "index.html"
-        if index_path.exists():
-            return FileResponse(index_path)
+        if INDEX_EXISTS:
+            return FileResponse(INDEX_PATH)
     
     return {"detail": "Frontend not built. Run 'npm run build' in frontend directory."}
@@ -1,15 +1,16 @@
 """Admin endpoints for managing the card catalog."""
 
-from decimal import Decimal
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
-from supabase import Client
+from postgrest.exceptions import APIError
+from pydantic import TypeAdapter
+from supabase import AsyncClient
 from gotrue.types import User
 
 from ..dependencies import get_supabase_admin_client, require_admin
 from ..services.cache import catalog_cache
+from ..services.queries import fetch_one
 from ..schemas import (
-    BenefitSchedule,
     Card,
     CardCreate,
     CardUpdate,
@@ -25,32 +26,30 @@ import string
 
 router = APIRouter()
 
+# Bulk validators so list endpoints parse every row in a single pydantic-core call
+_BENEFITS_ADAPTER = TypeAdapter(list[Benefit])
+_BENEFIT_CREATES_ADAPTER = TypeAdapter(list[BenefitCreate])
+_ACCESS_CODES_ADAPTER = TypeAdapter(list[AccessCode])
+
+# Admin views are cached briefly so dashboard polling doesn't hit Supabase;
+# the handlers below invalidate them on every write
+_ADMIN_CACHE_TTL = 60
+
 
 def _parse_card(row: dict) -> Card:
-    """Parse a card row from Supabase."""
-    return Card(
-        id=row["id"],
-        name=row["name"],
-        issuer=row["issuer"],
-        image_url=row.get("image_url"),
-        annual_fee=Decimal(str(row.get("annual_fee", 0))),
-        created_at=row.get("created_at"),
-        updated_at=row.get("updated_at"),
-    )
+    """Parse a card row from Supabase (numeric columns are coerced to Decimal)."""
+    return Card.model_validate(row)
 
 
 def _parse_benefit(row: dict) -> Benefit:
-    """Parse a benefit row from Supabase."""
-    return Benefit(
-        id=row["id"],
-        card_id=row["card_id"],
-        name=row["name"],
-        description=row.get("description"),
-        value=Decimal(str(row["value"])),
-        schedule=BenefitSchedule(row["schedule"]),
-        created_at=row.get("created_at"),
-        updated_at=row.get("updated_at"),
-    )
+    """Parse a benefit row from Supabase (numeric columns are coerced to Decimal)."""
+    return Benefit.model_validate(row)
+
+
+async def _reject_empty_update(supabase: AsyncClient, table: str, row_id: str, not_found: str):
+    """Reject an update with no fields, reporting a missing row (404) ahead of the empty body (400)."""
+    await fetch_one(supabase.table(table).select("id").eq("id", row_id).single(), not_found)
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
 
 
 # ============================================================
@@ -61,18 +60,18 @@ def _parse_benefit(row: dict) -> Benefit:
 async def create_card(
     request: CardCreate,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Create a new card in the catalog."""
-    result = supabase.table("cards").insert({
+    result = await supabase.table("cards").insert({
         "name": request.name,
         "issuer": request.issuer,
         "image_url": request.image_url,
         "annual_fee": float(request.annual_fee),
     }).execute()
     
-    # Invalidate cache
-    catalog_cache.invalidate("cards:")
+    # A new card only changes the catalog list
+    catalog_cache.invalidate_tag("cards")
     
     return _parse_card(result.data[0])
 
@@ -82,32 +81,22 @@ async def update_card(
     card_id: str,
     request: CardUpdate,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Update a card in the catalog."""
-    # Check if card exists
-    existing = supabase.table("cards").select("id").eq("id", card_id).execute()
-    if not existing.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-    
     # Build update dict with only provided fields
-    update_data = {}
-    if request.name is not None:
-        update_data["name"] = request.name
-    if request.issuer is not None:
-        update_data["issuer"] = request.issuer
-    if request.image_url is not None:
-        update_data["image_url"] = request.image_url
-    if request.annual_fee is not None:
-        update_data["annual_fee"] = float(request.annual_fee)
+    update_data = request.model_dump(exclude_unset=True, exclude_none=True)
     
     if not update_data:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
+        await _reject_empty_update(supabase, "cards", card_id, "Card not found")
     
-    result = supabase.table("cards").update(update_data).eq("id", card_id).execute()
+    # The update returns the changed row; no row means the card doesn't exist
+    result = await supabase.table("cards").update(update_data).eq("id", card_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
     
-    # Invalidate cache
-    catalog_cache.invalidate("cards:")
+    # Drops the card's detail views and the catalog list
+    catalog_cache.invalidate_tag(f"card:{card_id}")
     
     return _parse_card(result.data[0])
 
@@ -116,47 +105,54 @@ async def update_card(
 async def delete_card(
     card_id: str,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Delete a card from the catalog."""
-    # Check if card exists
-    existing = supabase.table("cards").select("id").eq("id", card_id).execute()
-    if not existing.data:
+    # The delete returns the removed row; no row means the card doesn't exist
+    result = await supabase.table("cards").delete().eq("id", card_id).execute()
+    if not result.data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
     
-    supabase.table("cards").delete().eq("id", card_id).execute()
-    
-    # Invalidate cache
-    catalog_cache.invalidate("cards:")
+    # Drops the card's detail views and the catalog list
+    catalog_cache.invalidate_tag(f"card:{card_id}")
 
 
 # ============================================================
 # Benefit Management
 # ============================================================
 
+# Upper bound on benefits accepted by the bulk endpoint in one request
+_MAX_BULK_BENEFITS = 500
+
+
+async def _insert_benefits(query):
+    """Run a benefit insert, relying on the card_id foreign key to reject unknown cards."""
+    try:
+        return await query.execute()
+    except APIError as e:
+        if e.code == "23503":  # foreign_key_violation
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found") from e
+        raise
+
+
 @router.post("/cards/{card_id}/benefits", response_model=Benefit, status_code=status.HTTP_201_CREATED)
 async def create_benefit(
     card_id: str,
     request: BenefitCreate,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Add a benefit to a card."""
-    # Verify card exists
-    card_result = supabase.table("cards").select("id").eq("id", card_id).execute()
-    if not card_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-    
-    result = supabase.table("benefits").insert({
+    result = await _insert_benefits(supabase.table("benefits").insert({
         "card_id": card_id,
         "name": request.name,
         "description": request.description,
         "value": float(request.value),
         "schedule": request.schedule.value,
-    }).execute()
+    }))
     
     # Invalidate cache for this card
-    catalog_cache.invalidate(f"cards:{card_id}")
+    catalog_cache.invalidate_tag(f"card:{card_id}")
     
     return _parse_benefit(result.data[0])
 
@@ -166,36 +162,30 @@ async def bulk_create_benefits(
     card_id: str,
     request: list[BenefitCreate],
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Bulk add multiple benefits to a card at once."""
-    # Verify card exists
-    card_result = supabase.table("cards").select("id").eq("id", card_id).execute()
-    if not card_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-    
     if not request:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No benefits provided")
+    if len(request) > _MAX_BULK_BENEFITS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {_MAX_BULK_BENEFITS} benefits can be added at once",
+        )
     
-    # Prepare all benefits for insertion
-    benefits_data = [
-        {
-            "card_id": card_id,
-            "name": b.name,
-            "description": b.description,
-            "value": float(b.value),
-            "schedule": b.schedule.value,
-        }
-        for b in request
-    ]
+    # Prepare all benefits for insertion (JSON mode: Decimal -> str, enum -> value)
+    benefits_data = _BENEFIT_CREATES_ADAPTER.dump_python(request, mode="json")
     
-    # Batch insert
-    result = supabase.table("benefits").insert(benefits_data).execute()
+    # Batch insert in a single statement on the database side
+    result = await _insert_benefits(supabase.rpc("insert_benefits", {
+        "p_card_id": card_id,
+        "p_rows": benefits_data,
+    }))
     
     # Invalidate cache for this card
-    catalog_cache.invalidate(f"cards:{card_id}")
+    catalog_cache.invalidate_tag(f"card:{card_id}")
     
-    return [_parse_benefit(row) for row in result.data]
+    return _BENEFITS_ADAPTER.validate_python(result.data)
 
 
 @router.put("/benefits/{benefit_id}", response_model=Benefit)
@@ -203,34 +193,23 @@ async def update_benefit(
     benefit_id: str,
     request: BenefitUpdate,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Update a benefit."""
-    # Check if benefit exists
-    existing = supabase.table("benefits").select("id, card_id").eq("id", benefit_id).execute()
-    if not existing.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Benefit not found")
-    
-    card_id = existing.data[0]["card_id"]
-    
     # Build update dict with only provided fields
-    update_data = {}
-    if request.name is not None:
-        update_data["name"] = request.name
-    if request.description is not None:
-        update_data["description"] = request.description
-    if request.value is not None:
-        update_data["value"] = float(request.value)
-    if request.schedule is not None:
-        update_data["schedule"] = request.schedule.value
+    update_data = request.model_dump(exclude_unset=True, exclude_none=True)
     
     if not update_data:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
+        await _reject_empty_update(supabase, "benefits", benefit_id, "Benefit not found")
     
-    result = supabase.table("benefits").update(update_data).eq("id", benefit_id).execute()
+    # The update returns the changed row; no row means the benefit doesn't exist
+    result = await supabase.table("benefits").update(update_data).eq("id", benefit_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Benefit not found")
     
     # Invalidate cache for this card
-    catalog_cache.invalidate(f"cards:{card_id}")
+    card_id = result.data[0]["card_id"]
+    catalog_cache.invalidate_tag(f"card:{card_id}")
     
     return _parse_benefit(result.data[0])
 
@@ -239,119 +218,121 @@ async def update_benefit(
 async def delete_benefit(
     benefit_id: str,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Delete a benefit."""
-    # Check if benefit exists
-    existing = supabase.table("benefits").select("id, card_id").eq("id", benefit_id).execute()
-    if not existing.data:
+    # The delete returns the removed row; no row means the benefit doesn't exist
+    result = await supabase.table("benefits").delete().eq("id", benefit_id).execute()
+    if not result.data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Benefit not found")
     
-    card_id = existing.data[0]["card_id"]
-    
-    supabase.table("benefits").delete().eq("id", benefit_id).execute()
-    
     # Invalidate cache for this card
-    catalog_cache.invalidate(f"cards:{card_id}")
+    card_id = result.data[0]["card_id"]
+    catalog_cache.invalidate_tag(f"card:{card_id}")
 
 
 @router.get("/cards/{card_id}", response_model=CardWithBenefits)
 async def get_card_with_benefits(
     card_id: str,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Get a card with all its benefits (admin view)."""
-    # Get card
-    card_result = supabase.table("cards").select("*").eq("id", card_id).execute()
-    if not card_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-    
-    card = _parse_card(card_result.data[0])
-    
-    # Get benefits
-    benefits_result = supabase.table("benefits").select("*").eq("card_id", card_id).order("name").execute()
-    benefits = [_parse_benefit(row) for row in benefits_result.data]
+    cache_key = f"admin:card:{card_id}"
+    cached = catalog_cache.get(cache_key)
+    if cached:
+        return cached
+    
+    # Get card with its benefits embedded in a single request
+    row = await fetch_one(
+        supabase.table("cards").select("*, benefits(*)").eq(
+            "id", card_id
+        ).order("name", foreign_table="benefits").single(),
+        "Card not found",
+    )
+    card = _parse_card(row)
+    benefits = _BENEFITS_ADAPTER.validate_python(row["benefits"])
     
-    return CardWithBenefits(**card.model_dump(), benefits=benefits)
+    full_card = CardWithBenefits.model_construct(**dict(card), benefits=benefits)
+    catalog_cache.set(cache_key, full_card, ttl_seconds=_ADMIN_CACHE_TTL, tags=[f"card:{card_id}"])
+    return full_card
 
 
 # ============================================================
 # Access Code Management
 # ============================================================
 
+# Uppercase letters and digits without the ambiguous O/0/I/1/L
+_ACCESS_CODE_ALPHABET = "".join(
+    c for c in string.ascii_uppercase + string.digits if c not in "OI0L1"
+)
+
+
 def _generate_access_code() -> str:
     """Generate a random 8-character access code."""
-    alphabet = string.ascii_uppercase + string.digits
-    # Remove ambiguous characters
-    alphabet = alphabet.replace('O', '').replace('0', '').replace('I', '').replace('1', '').replace('L', '')
-    return ''.join(secrets.choice(alphabet) for _ in range(8))
+    return ''.join(secrets.choice(_ACCESS_CODE_ALPHABET) for _ in range(8))
 
 
 def _parse_access_code(row: dict) -> AccessCode:
     """Parse an access code row from Supabase."""
-    return AccessCode(
-        id=row["id"],
-        code=row["code"],
-        created_at=row.get("created_at"),
-        created_by=row.get("created_by"),
-        used_at=row.get("used_at"),
-        used_by=row.get("used_by"),
-        invalidated_at=row.get("invalidated_at"),
-        notes=row.get("notes"),
-    )
+    return AccessCode.model_validate(row)
 
 
 @router.get("/access-codes", response_model=list[AccessCode])
 async def list_access_codes(
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """List all access codes."""
-    result = supabase.table("access_codes").select("*").order("created_at", desc=True).execute()
-    return [_parse_access_code(row) for row in result.data]
+    cached = catalog_cache.get("admin:access-codes")
+    if cached is not None:
+        return cached
+    
+    result = await supabase.table("access_codes").select("*").order("created_at", desc=True).execute()
+    codes = _ACCESS_CODES_ADAPTER.validate_python(result.data)
+    catalog_cache.set("admin:access-codes", codes, ttl_seconds=_ADMIN_CACHE_TTL)
+    return codes
 
 
 @router.post("/access-codes", response_model=AccessCode, status_code=status.HTTP_201_CREATED)
 async def create_access_code(
     request: AccessCodeCreate,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Generate a new access code."""
-    # Generate unique code
-    max_attempts = 10
+    # The UNIQUE constraint on access_codes.code catches collisions,
+    # so only retry when the insert is rejected as a duplicate
+    max_attempts = 3
     for _ in range(max_attempts):
-        code = _generate_access_code()
-        # Check if code already exists
-        existing = supabase.table("access_codes").select("id").eq("code", code).execute()
-        if not existing.data:
-            break
-    else:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate unique code")
-    
-    result = supabase.table("access_codes").insert({
-        "code": code,
-        "created_by": current_user.id,
-        "notes": request.notes,
-    }).execute()
-    
-    return _parse_access_code(result.data[0])
+        try:
+            result = await supabase.table("access_codes").insert({
+                "code": _generate_access_code(),
+                "created_by": current_user.id,
+                "notes": request.notes,
+            }).execute()
+        except APIError as e:
+            if e.code == "23505":  # unique_violation
+                continue
+            raise
+        catalog_cache.invalidate("admin:access-codes")
+        return _parse_access_code(result.data[0])
+    
+    raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate unique code")
 
 
 @router.delete("/access-codes/{code_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def invalidate_access_code(
     code_id: str,
     current_user: Annotated[User, Depends(require_admin)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Invalidate an access code (soft delete)."""
-    # Check if code exists
-    existing = supabase.table("access_codes").select("id").eq("id", code_id).execute()
-    if not existing.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Access code not found")
-    
-    # Soft delete by setting invalidated_at
-    supabase.table("access_codes").update({
+    # Soft delete by setting invalidated_at; no returned row means the code doesn't exist
+    result = await supabase.table("access_codes").update({
         "invalidated_at": "now()",
     }).eq("id", code_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Access code not found")
+    
+    catalog_cache.invalidate("admin:access-codes")
@@ -2,11 +2,17 @@
 
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
-from supabase import Client
+from supabase import AsyncClient
 from gotrue.types import User
 
 from ..config import Settings, get_settings
-from ..dependencies import get_supabase_client, get_supabase_admin_client, get_current_user, is_user_admin
+from ..dependencies import (
+    get_supabase_client,
+    get_supabase_admin_client,
+    get_current_user,
+    get_current_user_profile,
+)
+from ..services.cache import catalog_cache
 from ..schemas import (
     SignUpRequest,
     LoginRequest,
@@ -20,11 +26,32 @@ from ..schemas import (
 router = APIRouter()
 
 
+async def _access_code_rejection(admin_client: AsyncClient, code: str) -> str:
+    """Explain why an access code could not be claimed."""
+    result = await admin_client.table("access_codes").select(
+        "used_at, invalidated_at"
+    ).eq("code", code).execute()
+    
+    if not result.data:
+        return "Invalid access code"
+    if result.data[0].get("used_at"):
+        return "This access code has already been used"
+    return "This access code is no longer valid"
+
+
+async def _release_access_code(admin_client: AsyncClient, code_id: str) -> None:
+    """Return a claimed access code to the pool after a failed signup."""
+    await admin_client.table("access_codes").update({
+        "used_at": None,
+    }).eq("id", code_id).execute()
+    catalog_cache.invalidate("admin:access-codes")
+
+
 @router.post("/signup", response_model=AuthResponse)
 async def signup(
     request: SignUpRequest,
-    supabase: Annotated[Client, Depends(get_supabase_client)],
-    admin_client: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_client)],
+    admin_client: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
     settings: Annotated[Settings, Depends(get_settings)],
 ):
     """
@@ -33,89 +60,35 @@ async def signup(
     Returns access and refresh tokens on successful signup.
     Requires a valid access code.
     """
-    # Validate access code
-    access_code_result = admin_client.table("access_codes").select("*").eq(
-        "code", request.access_code.upper().strip()
-    ).execute()
-    
-    if not access_code_result.data:
+    # Validate password
+    if len(request.password) < 6:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid access code",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Password must be at least 6 characters",
         )
     
-    access_code_row = access_code_result.data[0]
+    # Claim the access code in a single UPDATE; the filters make it a no-op for
+    # unknown, used or invalidated codes, so two signups can't share one code
+    code = request.access_code.upper().strip()
+    claim_result = await admin_client.table("access_codes").update({
+        "used_at": "now()",
+    }).eq("code", code).is_("used_at", "null").is_("invalidated_at", "null").execute()
     
-    # Check if code is already used
-    if access_code_row.get("used_at"):
+    if not claim_result.data:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="This access code has already been used",
+            detail=await _access_code_rejection(admin_client, code),
         )
     
-    # Check if code is invalidated
-    if access_code_row.get("invalidated_at"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This access code is no longer valid",
-        )
-    
-    # Validate password
-    if len(request.password) < 6:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must be at least 6 characters",
-        )
+    code_id = claim_result.data[0]["id"]
     
     try:
-        response = supabase.auth.sign_up({
+        response = await supabase.auth.sign_up({
             "email": request.email,
             "password": request.password,
         })
-        
-        if response.user is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create user account",
-            )
-        
-        # Mark access code as used
-        admin_client.table("access_codes").update({
-            "used_at": "now()",
-            "used_by": response.user.id,
-        }).eq("id", access_code_row["id"]).execute()
-        
-        if response.session is None:
-            # Email confirmation required
-            return AuthResponse(
-                access_token="",
-                refresh_token="",
-                token_type="bearer",
-                expires_in=0,
-                user=UserInfo(
-                    id=response.user.id,
-                    email=response.user.email or "",
-                    created_at=str(response.user.created_at),
-                    email_confirmed=False,
-                ),
-            )
-        
-        return AuthResponse(
-            access_token=response.session.access_token,
-            refresh_token=response.session.refresh_token,
-            token_type="bearer",
-            expires_in=response.session.expires_in or 3600,
-            user=UserInfo(
-                id=response.user.id,
-                email=response.user.email or "",
-                created_at=str(response.user.created_at),
-                email_confirmed=True,
-            ),
-        )
-        
-    except HTTPException:
-        raise
     except Exception as e:
+        await _release_access_code(admin_client, code_id)
         error_msg = str(e).lower()
         if "already registered" in error_msg or "already been registered" in error_msg:
             raise HTTPException(
@@ -126,12 +99,53 @@ async def signup(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         ) from e
+    
+    if response.user is None:
+        await _release_access_code(admin_client, code_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create user account",
+        )
+    
+    # Record who used the access code
+    await admin_client.table("access_codes").update({
+        "used_by": response.user.id,
+    }).eq("id", code_id).execute()
+    catalog_cache.invalidate("admin:access-codes")
+    
+    if response.session is None:
+        # Email confirmation required
+        return AuthResponse(
+            access_token="",
+            refresh_token="",
+            token_type="bearer",
+            expires_in=0,
+            user=UserInfo(
+                id=response.user.id,
+                email=response.user.email or "",
+                created_at=str(response.user.created_at),
+                email_confirmed=False,
+            ),
+        )
+    
+    return AuthResponse(
+        access_token=response.session.access_token,
+        refresh_token=response.session.refresh_token,
+        token_type="bearer",
+        expires_in=response.session.expires_in or 3600,
+        user=UserInfo(
+            id=response.user.id,
+            email=response.user.email or "",
+            created_at=str(response.user.created_at),
+            email_confirmed=True,
+        ),
+    )
 
 
 @router.post("/login", response_model=AuthResponse)
 async def login(
     request: LoginRequest,
-    supabase: Annotated[Client, Depends(get_supabase_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_client)],
 ):
     """
     Sign in with email and password.
@@ -139,7 +153,7 @@ async def login(
     Returns access and refresh tokens on successful login.
     """
     try:
-        response = supabase.auth.sign_in_with_password({
+        response = await supabase.auth.sign_in_with_password({
             "email": request.email,
             "password": request.password,
         })
@@ -175,7 +189,7 @@ async def login(
 @router.post("/logout", response_model=MessageResponse)
 async def logout(
     current_user: Annotated[User, Depends(get_current_user)],
-    admin_client: Annotated[Client, Depends(get_supabase_admin_client)],
+    admin_client: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """
     Sign out the current user session.
@@ -185,7 +199,7 @@ async def logout(
     """
     try:
         # Use admin client to sign out user by ID (invalidates all sessions)
-        admin_client.auth.admin.sign_out(current_user.id)
+        await admin_client.auth.admin.sign_out(current_user.id)
         return MessageResponse(message="Successfully logged out")
     except Exception:
         # Even if server-side logout fails, client should clear tokens
@@ -196,7 +210,7 @@ async def logout(
 @router.post("/refresh", response_model=AuthResponse)
 async def refresh_token(
     request: RefreshRequest,
-    supabase: Annotated[Client, Depends(get_supabase_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_client)],
 ):
     """
     Refresh the access token using a refresh token.
@@ -204,7 +218,7 @@ async def refresh_token(
     Returns new access and refresh tokens.
     """
     try:
-        response = supabase.auth.refresh_session(request.refresh_token)
+        response = await supabase.auth.refresh_session(request.refresh_token)
         
         if response.session is None or response.user is None:
             raise HTTPException(
@@ -236,18 +250,19 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def get_me(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[User, Depends(get_current_user_profile)],
 ):
     """
     Get the current authenticated user's information.
     
     Requires a valid access token in the Authorization header.
     """
+    app_meta = current_user.app_metadata or {}
     return UserResponse(
         id=current_user.id,
         email=current_user.email or "",
         created_at=str(current_user.created_at),
         updated_at=str(current_user.updated_at) if current_user.updated_at else None,
         user_metadata=current_user.user_metadata or {},
-        is_admin=is_user_admin(current_user),
+        is_admin=app_meta.get("is_admin") is True,
     )
@@ -1,14 +1,23 @@
 """Card catalog and user card management endpoints."""
 
+import asyncio
+import hashlib
 from datetime import date, datetime
+from functools import lru_cache
+from operator import itemgetter
 from zoneinfo import ZoneInfo
 from decimal import Decimal
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from supabase import Client
+from typing import Annotated, Callable, Final, Iterable
+from cachetools import LRUCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from postgrest.exceptions import APIError
+from pydantic import TypeAdapter
+from supabase import AsyncClient
 from gotrue.types import User
 
-from ..dependencies import get_supabase_admin_client, get_current_user
+from ..dependencies import get_benefits_loader, get_preferences_loader, get_supabase_admin_client, get_current_user
+from ..services.loaders import BatchLoader
+from ..services.queries import fetch_one
 from ..services.cache import catalog_cache
 from ..schemas import (
     BenefitSchedule,
@@ -31,122 +40,283 @@ from ..schemas import (
 
 router = APIRouter()
 
+_EASTERN = ZoneInfo("America/New_York")
+
+# Computed per-user views (dashboard, summaries) are cached briefly and
+# dropped whenever the user changes their cards, redemptions or preferences
+_USER_VIEW_TTL = 60
+
+# Lookups of unknown card ids are remembered briefly so repeated misses
+# don't each reach the database
+_CARD_NOT_FOUND: Final = object()
+_NOT_FOUND_TTL = 30
+
+# Parsed catalog rows keyed by version. The updated_at triggers on cards and
+# benefits change the key on every edit, so entries never need invalidating.
+_parsed_cards: LRUCache[tuple, Card] = LRUCache(maxsize=4096)
+_parsed_benefits: LRUCache[tuple, Benefit] = LRUCache(maxsize=4096)
+
+# Columns the user card views read from redemptions and preferences
+_REDEMPTION_COLUMNS = "user_card_id, benefit_id, period_year, period_month, period_quarter, period_half, amount_redeemed"
+_PREFERENCE_COLUMNS = "user_card_id, benefit_id, auto_redeem, hidden"
+
+# Bulk validator so benefit lists are parsed in a single pydantic-core call
+_BENEFITS_ADAPTER = TypeAdapter(list[Benefit])
+_CARDS_ADAPTER = TypeAdapter(list[Card])
+
+# Serializers for the larger user responses, dumped straight to JSON bytes
+_AVAILABLE_BENEFITS_ADAPTER = TypeAdapter(list[AvailableBenefit])
+_USER_CARDS_ADAPTER = TypeAdapter(list[UserCardWithBenefits])
+
+
+@lru_cache(maxsize=8192)
+def _decimal(value: str) -> Decimal:
+    """Parse a numeric column; amounts repeat across rows, so parses are cached."""
+    return Decimal(value)
+
+
+def _cache_entry(payload: bytes) -> tuple[bytes, str]:
+    """Pair a serialized response body with its ETag for the catalog cache."""
+    return payload, f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+
+
+def _json_response(request: Request, entry: tuple[bytes, str], cache_hit: bool) -> Response:
+    """
+    Return a cached JSON body, or 304 if the client already has this version.
+    
+    The body is pre-serialized, so FastAPI skips response model serialization.
+    """
+    payload, etag = entry
+    headers = {
+        "ETag": etag,
+        # Clients revalidate every time, so catalog edits show up immediately
+        "Cache-Control": "private, no-cache",
+        "x-cache": "HIT" if cache_hit else "MISS",
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=payload, media_type="application/json", headers=headers)
+
 
 def _today_eastern() -> date:
     """Return today's date in Eastern Time."""
-    return datetime.now(ZoneInfo("America/New_York")).date()
+    return datetime.now(_EASTERN).date()
+
+
+def _user_view_tags(user_id: str, card_ids: Iterable[str]) -> list[str]:
+    """Cache tags for a per-user view, so admin edits to the user's cards drop it too."""
+    return [f"user:{user_id}", *(f"card:{card_id}" for card_id in card_ids)]
+
+
+def _invalidate_user_views(user_id: str):
+    catalog_cache.invalidate_tag(f"user:{user_id}")
 
 
 def _parse_card(row: dict) -> Card:
-    """Parse a card row from Supabase."""
-    return Card(
-        id=row["id"],
-        name=row["name"],
-        issuer=row["issuer"],
-        image_url=row.get("image_url"),
-        annual_fee=Decimal(str(row.get("annual_fee", 0))),
-        created_at=row.get("created_at"),
-        updated_at=row.get("updated_at"),
-    )
+    """Parse a card row from Supabase (numeric columns are coerced to Decimal)."""
+    if row.get("updated_at") is None:
+        return Card.model_validate(row)
+    key = (row["id"], row["updated_at"], row.get("benefits_count"))
+    card = _parsed_cards.get(key)
+    if card is None:
+        card = _parsed_cards[key] = Card.model_validate(row)
+    return card
 
 
 def _parse_benefit(row: dict) -> Benefit:
-    """Parse a benefit row from Supabase."""
-    return Benefit(
-        id=row["id"],
-        card_id=row["card_id"],
-        name=row["name"],
-        description=row.get("description"),
-        value=Decimal(str(row["value"])),
-        schedule=BenefitSchedule(row["schedule"]),
-        created_at=row.get("created_at"),
-        updated_at=row.get("updated_at"),
-    )
+    """Parse a benefit row from Supabase (numeric columns are coerced to Decimal)."""
+    if row.get("updated_at") is None:
+        return Benefit.model_validate(row)
+    key = (row["id"], row["updated_at"])
+    benefit = _parsed_benefits.get(key)
+    if benefit is None:
+        benefit = _parsed_benefits[key] = Benefit.model_validate(row)
+    return benefit
+
+
+def _timestamp(value: str | None) -> datetime | None:
+    """Parse a timestamptz column from PostgREST's ISO 8601 output."""
+    return datetime.fromisoformat(value) if value is not None else None
 
 
 def _parse_user_card(row: dict, card: Card) -> UserCard:
-    """Parse a user_card row from Supabase."""
-    return UserCard(
+    """
+    Parse a user_card row from Supabase.
+    
+    The columns are converted directly rather than validated, since the row
+    comes from the database and `card` is already a validated model.
+    """
+    return UserCard.model_construct(
         id=row["id"],
         user_id=row["user_id"],
         card_id=row["card_id"],
-        card_open_date=date.fromisoformat(row["card_open_date"]) if isinstance(row["card_open_date"], str) else row["card_open_date"],
+        card_open_date=date.fromisoformat(row["card_open_date"]),
         nickname=row.get("nickname"),
         card=card,
-        created_at=row.get("created_at"),
-        updated_at=row.get("updated_at"),
+        created_at=_timestamp(row.get("created_at")),
+        updated_at=_timestamp(row.get("updated_at")),
     )
 
 
-def _calculate_current_period(schedule: BenefitSchedule, card_open_date: date) -> tuple[int, int | None, int | None, int | None]:
-    """Calculate the current period (year, month, quarter, half) for a benefit schedule."""
-    today = _today_eastern()
-    
-    if schedule == BenefitSchedule.calendar_year:
-        return (today.year, None, None, None)
-    elif schedule == BenefitSchedule.card_year:
-        # Card year is based on anniversary
-        years_since_open = today.year - card_open_date.year
-        if (today.month, today.day) < (card_open_date.month, card_open_date.day):
-            years_since_open -= 1
-        return (years_since_open, None, None, None)
-    elif schedule == BenefitSchedule.monthly:
-        return (today.year, today.month, None, None)
-    elif schedule == BenefitSchedule.quarterly:
-        quarter = (today.month - 1) // 3 + 1
-        return (today.year, None, quarter, None)
-    elif schedule == BenefitSchedule.biannual:
-        half = 1 if today.month <= 6 else 2
-        return (today.year, None, None, half)
-    elif schedule == BenefitSchedule.one_time:
-        return (0, None, None, None)  # Special case: one-time has no period
+async def _fetch_user_card_benefit(
+    supabase: AsyncClient, user_card_id: str, user_id: str, benefit_id: str
+) -> tuple[dict, dict]:
+    """
+    Fetch one of the user's cards and one benefit of that card in a single query.
     
+    The benefit is embedded through the card, so ownership and the benefit's
+    card are checked together. Raises 404 if either is missing. The user card's
+    card_open_date is returned already parsed to a date.
+    """
+    uc_row = await fetch_one(
+        supabase.table("user_cards").select("*, cards(benefits(*))")
+        .eq("id", user_card_id).eq("user_id", user_id)
+        .eq("cards.benefits.id", benefit_id).single(),
+        "Card not found in your profile",
+    )
+    benefit_rows = uc_row.pop("cards")["benefits"]
+    if not benefit_rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Benefit not found for this card")
+    uc_row["card_open_date"] = date.fromisoformat(uc_row["card_open_date"])
+    return uc_row, benefit_rows[0]
+
+
+def _calendar_year_period(card_open_date: date, today: date) -> tuple[int, int | None, int | None, int | None]:
     return (today.year, None, None, None)
 
 
-def _calculate_reset_date(schedule: BenefitSchedule, card_open_date: date) -> date | None:
+def _card_year_period(card_open_date: date, today: date) -> tuple[int, int | None, int | None, int | None]:
+    # Card year is based on anniversary
+    years_since_open = today.year - card_open_date.year
+    if (today.month, today.day) < (card_open_date.month, card_open_date.day):
+        years_since_open -= 1
+    return (years_since_open, None, None, None)
+
+
+def _monthly_period(card_open_date: date, today: date) -> tuple[int, int | None, int | None, int | None]:
+    return (today.year, today.month, None, None)
+
+
+def _quarterly_period(card_open_date: date, today: date) -> tuple[int, int | None, int | None, int | None]:
+    return (today.year, None, (today.month - 1) // 3 + 1, None)
+
+
+def _biannual_period(card_open_date: date, today: date) -> tuple[int, int | None, int | None, int | None]:
+    return (today.year, None, None, 1 if today.month <= 6 else 2)
+
+
+def _one_time_period(card_open_date: date, today: date) -> tuple[int, int | None, int | None, int | None]:
+    return (0, None, None, None)  # Special case: one-time has no period
+
+
+_PERIOD_FUNCS: Final[dict[BenefitSchedule, Callable[[date, date], tuple[int, int | None, int | None, int | None]]]] = {
+    BenefitSchedule.calendar_year: _calendar_year_period,
+    BenefitSchedule.card_year: _card_year_period,
+    BenefitSchedule.monthly: _monthly_period,
+    BenefitSchedule.quarterly: _quarterly_period,
+    BenefitSchedule.biannual: _biannual_period,
+    BenefitSchedule.one_time: _one_time_period,
+}
+
+
+@lru_cache(maxsize=1024)
+def _calculate_current_period(schedule: BenefitSchedule, card_open_date: date, today: date) -> tuple[int, int | None, int | None, int | None]:
+    """
+    Calculate the current period (year, month, quarter, half) for a benefit schedule.
+    
+    Memoized: every benefit on a card with the same schedule shares the result.
+    """
+    return _PERIOD_FUNCS.get(schedule, _calendar_year_period)(card_open_date, today)
+
+
+def _calendar_year_reset(card_open_date: date, today: date) -> date | None:
+    return date(today.year + 1, 1, 1)
+
+
+def _card_year_reset(card_open_date: date, today: date) -> date | None:
+    # Next anniversary is this year unless it has already passed (or is today)
+    year = today.year
+    if (card_open_date.month, card_open_date.day) <= (today.month, today.day):
+        year += 1
+    return date(year, card_open_date.month, card_open_date.day)
+
+
+def _monthly_reset(card_open_date: date, today: date) -> date | None:
+    return date(today.year + 1, 1, 1) if today.month == 12 else date(today.year, today.month + 1, 1)
+
+
+def _quarterly_reset(card_open_date: date, today: date) -> date | None:
+    # First month of the next quarter: 4, 7, 10, or 1 of the next year
+    next_quarter_month = (today.month - 1) // 3 * 3 + 4
+    return date(today.year + 1, 1, 1) if next_quarter_month > 12 else date(today.year, next_quarter_month, 1)
+
+
+def _biannual_reset(card_open_date: date, today: date) -> date | None:
+    return date(today.year, 7, 1) if today.month <= 6 else date(today.year + 1, 1, 1)
+
+
+def _no_reset(card_open_date: date, today: date) -> date | None:
+    return None  # One-time benefits never reset
+
+
+_RESET_FUNCS: Final[dict[BenefitSchedule, Callable[[date, date], date | None]]] = {
+    BenefitSchedule.calendar_year: _calendar_year_reset,
+    BenefitSchedule.card_year: _card_year_reset,
+    BenefitSchedule.monthly: _monthly_reset,
+    BenefitSchedule.quarterly: _quarterly_reset,
+    BenefitSchedule.biannual: _biannual_reset,
+    BenefitSchedule.one_time: _no_reset,
+}
+
+
+@lru_cache(maxsize=1024)
+def _calculate_reset_date(schedule: BenefitSchedule, card_open_date: date, today: date) -> date | None:
     """Calculate when a benefit resets."""
-    today = _today_eastern()
+    return _RESET_FUNCS.get(schedule, _no_reset)(card_open_date, today)
+
+
+def _current_period_filter(today: date) -> str:
+    """
+    PostgREST `or` filter for the period_years a current-period redemption can have.
+    
+    Calendar periods use the calendar year; card-year and one-time periods use
+    small numbers (years since the card was opened, or 0), all below 1000.
+    Used on embedded redemptions so the query skips each card's old history.
+    """
+    return f"period_year.eq.{today.year},period_year.lt.1000"
+
+
+def _redemptions_by_period(rows: Iterable[dict]) -> dict[tuple, dict]:
+    """
+    Index redemption rows by (user_card_id, benefit_id, *period).
     
-    if schedule == BenefitSchedule.calendar_year:
-        return date(today.year + 1, 1, 1)
-    elif schedule == BenefitSchedule.card_year:
-        next_anniversary = date(today.year, card_open_date.month, card_open_date.day)
-        if next_anniversary <= today:
-            next_anniversary = date(today.year + 1, card_open_date.month, card_open_date.day)
-        return next_anniversary
-    elif schedule == BenefitSchedule.monthly:
-        if today.month == 12:
-            return date(today.year + 1, 1, 1)
-        return date(today.year, today.month + 1, 1)
-    elif schedule == BenefitSchedule.quarterly:
-        quarter = (today.month - 1) // 3 + 1
-        if quarter == 4:
-            return date(today.year + 1, 1, 1)
-        return date(today.year, quarter * 3 + 1, 1)
-    elif schedule == BenefitSchedule.biannual:
-        if today.month <= 6:
-            return date(today.year, 7, 1)
-        return date(today.year + 1, 1, 1)
-    elif schedule == BenefitSchedule.one_time:
-        return None  # One-time benefits never reset
-    
-    return None
+    Redemptions are stored with the exact tuple _calculate_current_period
+    returned when they were made, so the current one is a single lookup of
+    (user_card_id, benefit_id, *current_period).
+    """
+    by_period: dict[tuple, dict] = {}
+    for r in rows:
+        key = (r["user_card_id"], r["benefit_id"], r["period_year"], r.get("period_month"), r.get("period_quarter"), r.get("period_half"))
+        by_period.setdefault(key, r)
+    return by_period
+
+
+_TOTAL_COUNT_FOR_YEAR: Final[dict[BenefitSchedule, int]] = {
+    BenefitSchedule.monthly: 12,
+    BenefitSchedule.quarterly: 4,
+    BenefitSchedule.biannual: 2,
+}
 
 
 def _get_total_count_for_year(schedule: BenefitSchedule) -> int:
     """Get the total number of redemptions possible in a year for a schedule type."""
-    if schedule == BenefitSchedule.monthly:
-        return 12
-    elif schedule == BenefitSchedule.quarterly:
-        return 4
-    elif schedule == BenefitSchedule.biannual:
-        return 2
-    elif schedule in (BenefitSchedule.calendar_year, BenefitSchedule.card_year):
-        return 1
-    elif schedule == BenefitSchedule.one_time:
-        return 1
-    return 1
+    return _TOTAL_COUNT_FOR_YEAR.get(schedule, 1)
 
 
 # ============================================================
@@ -155,60 +325,69 @@ def _get_total_count_for_year(schedule: BenefitSchedule) -> int:
 
 @router.get("/cards", response_model=list[Card])
 async def list_cards(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """List all cards in the catalog."""
+    # The catalog cache holds the serialized JSON body and its ETag, not the models
     cache_key = "cards:list"
     cached = catalog_cache.get(cache_key)
     if cached is not None:
-        return cached
+        return _json_response(request, cached, cache_hit=True)
 
-    result = supabase.table("cards").select("*").order("name").execute()
-    
-    # Get benefits count for each card
-    benefits_result = supabase.table("benefits").select("card_id").execute()
-    benefits_count_by_card: dict[str, int] = {}
-    for b in benefits_result.data:
-        card_id = b["card_id"]
-        benefits_count_by_card[card_id] = benefits_count_by_card.get(card_id, 0) + 1
-    
-    cards = []
-    for row in result.data:
-        card = _parse_card(row)
-        card.benefits_count = benefits_count_by_card.get(card.id, 0)
-        cards.append(card)
-    
-    catalog_cache.set(cache_key, cards)
-    return cards
+    # Concurrent misses wait for a single rebuild instead of each querying Supabase
+    async with catalog_cache.lock(cache_key):
+        cached = catalog_cache.get(cache_key)
+        if cached is not None:
+            return _json_response(request, cached, cache_hit=True)
+        
+        # The view aggregates the benefits count per card in the database
+        result = await supabase.table("cards_with_counts").select("*").order("name").execute()
+        cards = [_parse_card(row) for row in result.data]
+        
+        # Tagged with every card so a write to any of them drops the list
+        entry = _cache_entry(_CARDS_ADAPTER.dump_json(cards))
+        catalog_cache.set(cache_key, entry, tags=["cards", *(f"card:{c.id}" for c in cards)])
+    return _json_response(request, entry, cache_hit=False)
 
 
 @router.get("/cards/{card_id}", response_model=CardWithBenefits)
 async def get_card(
     card_id: str,
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Get a card with its benefits."""
     cache_key = f"cards:{card_id}"
     cached = catalog_cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    # Get card
-    card_result = supabase.table("cards").select("*").eq("id", card_id).execute()
-    if not card_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-    
-    card = _parse_card(card_result.data[0])
-    
-    # Get benefits
-    benefits_result = supabase.table("benefits").select("*").eq("card_id", card_id).order("name").execute()
-    benefits = [_parse_benefit(row) for row in benefits_result.data]
+    if cached is None:
+        async with catalog_cache.lock(cache_key):
+            cached = catalog_cache.get(cache_key)
+            if cached is None:
+                # Get card with its benefits embedded in a single request
+                try:
+                    row = await fetch_one(
+                        supabase.table("cards").select("*, benefits(*)").eq(
+                            "id", card_id
+                        ).order("name", foreign_table="benefits").single(),
+                        "Card not found",
+                    )
+                except HTTPException:
+                    catalog_cache.set(cache_key, _CARD_NOT_FOUND, ttl_seconds=_NOT_FOUND_TTL, tags=[f"card:{card_id}"])
+                    raise
+                card = _parse_card(row)
+                benefits = _BENEFITS_ADAPTER.validate_python(row["benefits"])
+                
+                full_card = CardWithBenefits.model_construct(**dict(card), benefits=benefits)
+                entry = _cache_entry(full_card.model_dump_json().encode())
+                catalog_cache.set(cache_key, entry, tags=[f"card:{card_id}"])
+                return _json_response(request, entry, cache_hit=False)
     
-    full_card = CardWithBenefits(**card.model_dump(), benefits=benefits)
-    catalog_cache.set(cache_key, full_card)
-    return full_card
+    if cached is _CARD_NOT_FOUND:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
+    return _json_response(request, cached, cache_hit=True)
 
 
 # ============================================================
@@ -217,91 +396,89 @@ async def get_card(
 
 @router.get("/user/cards", response_model=list[UserCardWithBenefits])
 async def list_user_cards(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
+    benefits_loader: Annotated[BatchLoader[str, list[dict]], Depends(get_benefits_loader)],
 ):
     """List all cards the user has added with benefits and redemption status."""
-    # Get user's cards with card details
-    user_cards_result = supabase.table("user_cards").select(
-        "*, cards(*)"
-    ).eq("user_id", current_user.id).execute()
+    today = _today_eastern()
+    cache_key = f"user:{current_user.id}:cards:{today}"
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(request, cached, cache_hit=True)
+    
+    # Get user's cards with card details and current-period redemptions embedded
+    user_cards_result = await supabase.table("user_cards").select(
+        f"*, cards(*), benefit_redemptions({_REDEMPTION_COLUMNS})"
+    ).eq("user_id", current_user.id).or_(
+        _current_period_filter(today), reference_table="benefit_redemptions"
+    ).execute()
+    
+    if not user_cards_result.data:
+        return []
+    
+    # Get benefits for all of the user's cards (cached, or one batched query)
+    benefit_rows_by_card = await benefits_loader.load_many(
+        uc_row["card_id"] for uc_row in user_cards_result.data
+    )
+    
+    redemptions_by_period = _redemptions_by_period(
+        r for uc_row in user_cards_result.data for r in uc_row["benefit_redemptions"]
+    )
     
     result = []
-    for uc_row in user_cards_result.data:
+    for uc_row, benefit_rows in zip(user_cards_result.data, benefit_rows_by_card):
         card = _parse_card(uc_row["cards"])
         user_card = _parse_user_card(uc_row, card)
         
-        # Get benefits for this card
-        benefits_result = supabase.table("benefits").select("*").eq("card_id", card.id).execute()
-        
-        # Get redemptions for this user_card
-        redemptions_result = supabase.table("benefit_redemptions").select("*").eq("user_card_id", user_card.id).execute()
-        redemptions_by_benefit: dict[str, list[dict]] = {}
-        for r in redemptions_result.data:
-            bid = r["benefit_id"]
-            if bid not in redemptions_by_benefit:
-                redemptions_by_benefit[bid] = []
-            redemptions_by_benefit[bid].append(r)
-        
         available_benefits = []
-        for b_row in benefits_result.data:
+        for b_row in benefit_rows:
             benefit = _parse_benefit(b_row)
-            period = _calculate_current_period(benefit.schedule, user_card.card_open_date)
+            period = _calculate_current_period(benefit.schedule, user_card.card_open_date, today)
             
             # Check if redeemed in current period
-            is_redeemed = False
-            if benefit.id in redemptions_by_benefit:
-                for r in redemptions_by_benefit[benefit.id]:
-                    if benefit.schedule == BenefitSchedule.one_time:
-                        is_redeemed = True
-                        break
-                    elif r["period_year"] == period[0]:
-                        if period[1] is not None and r.get("period_month") == period[1]:
-                            is_redeemed = True
-                            break
-                        elif period[2] is not None and r.get("period_quarter") == period[2]:
-                            is_redeemed = True
-                            break
-                        elif period[3] is not None and r.get("period_half") == period[3]:
-                            is_redeemed = True
-                            break
-                        elif period[1] is None and period[2] is None and period[3] is None:
-                            is_redeemed = True
-                            break
+            is_redeemed = (user_card.id, benefit.id, *period) in redemptions_by_period
             
-            available_benefits.append(AvailableBenefit(
+            # Parts are already-validated models, so skip revalidating them
+            available_benefits.append(AvailableBenefit.model_construct(
                 benefit=benefit,
                 user_card=user_card,
                 is_redeemed=is_redeemed,
-                resets_at=_calculate_reset_date(benefit.schedule, user_card.card_open_date),
+                resets_at=_calculate_reset_date(benefit.schedule, user_card.card_open_date, today),
             ))
         
-        result.append(UserCardWithBenefits(**user_card.model_dump(), benefits=available_benefits))
+        result.append(UserCardWithBenefits.model_construct(**dict(user_card), benefits=available_benefits))
     
-    return result
+    card_ids = [uc_row["card_id"] for uc_row in user_cards_result.data]
+    entry = _cache_entry(_USER_CARDS_ADAPTER.dump_json(result))
+    catalog_cache.set(cache_key, entry, ttl_seconds=_USER_VIEW_TTL, tags=_user_view_tags(current_user.id, card_ids))
+    return _json_response(request, entry, cache_hit=False)
 
 
 @router.post("/user/cards", response_model=UserCard, status_code=status.HTTP_201_CREATED)
 async def add_user_card(
     request: UserCardCreate,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Add a card to the user's profile."""
     # Verify card exists
-    card_result = supabase.table("cards").select("*").eq("id", request.card_id).execute()
-    if not card_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
+    card_row = await fetch_one(
+        supabase.table("cards").select("*").eq("id", request.card_id).single(),
+        "Card not found",
+    )
     
     # Add card
-    result = supabase.table("user_cards").insert({
+    result = await supabase.table("user_cards").insert({
         "user_id": current_user.id,
         "card_id": request.card_id,
         "card_open_date": request.card_open_date.isoformat(),
         "nickname": request.nickname,
     }).execute()
     
-    card = _parse_card(card_result.data[0])
+    _invalidate_user_views(current_user.id)
+    card = _parse_card(card_row)
     return _parse_user_card(result.data[0], card)
 
 
@@ -310,15 +487,14 @@ async def update_user_card(
     user_card_id: str,
     request: UserCardUpdate,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Update a user's card details."""
     # Verify ownership
-    uc_result = supabase.table("user_cards").select("*, cards(*)").eq("id", user_card_id).eq("user_id", current_user.id).execute()
-    if not uc_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in your profile")
-    
-    uc_row = uc_result.data[0]
+    uc_row = await fetch_one(
+        supabase.table("user_cards").select("*, cards(*)").eq("id", user_card_id).eq("user_id", current_user.id).single(),
+        "Card not found in your profile",
+    )
     
     # Build update data
     update_data = {}
@@ -333,7 +509,8 @@ async def update_user_card(
         card = _parse_card(uc_row["cards"])
         return _parse_user_card(uc_row, card)
         
-    result = supabase.table("user_cards").update(update_data).eq("id", user_card_id).execute()
+    result = await supabase.table("user_cards").update(update_data).eq("id", user_card_id).execute()
+    _invalidate_user_views(current_user.id)
     
     # Return updated object
     card = _parse_card(uc_row["cards"])
@@ -344,15 +521,14 @@ async def update_user_card(
 async def remove_user_card(
     user_card_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Remove a card from the user's profile."""
-    # Verify ownership
-    result = supabase.table("user_cards").select("id").eq("id", user_card_id).eq("user_id", current_user.id).execute()
+    # Scope the delete to the user's own cards; no returned row means not found
+    result = await supabase.table("user_cards").delete().eq("id", user_card_id).eq("user_id", current_user.id).execute()
     if not result.data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in your profile")
-    
-    supabase.table("user_cards").delete().eq("id", user_card_id).execute()
+    _invalidate_user_views(current_user.id)
 
 
 # ============================================================
@@ -361,53 +537,49 @@ async def remove_user_card(
 
 @router.get("/user/benefits/available", response_model=list[AvailableBenefit])
 async def list_available_benefits(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
+    benefits_loader: Annotated[BatchLoader[str, list[dict]], Depends(get_benefits_loader)],
     show_hidden: bool = Query(default=False, description="Include hidden benefits"),
 ):
     """List all unredeemed benefits across all user's cards (for dashboard)."""
-    # Get user's cards
-    user_cards_result = supabase.table("user_cards").select("*, cards(*)").eq("user_id", current_user.id).execute()
+    today = _today_eastern()
+    cache_key = f"user:{current_user.id}:available:{today}:{show_hidden}"
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(request, cached, cache_hit=True)
+    
+    # Get user's cards with card details, current-period redemptions and
+    # preferences embedded in one request
+    user_cards_result = await supabase.table("user_cards").select(
+        f"*, cards(*), benefit_redemptions({_REDEMPTION_COLUMNS}), user_benefit_preferences({_PREFERENCE_COLUMNS})"
+    ).eq("user_id", current_user.id).or_(
+        _current_period_filter(today), reference_table="benefit_redemptions"
+    ).execute()
     
     if not user_cards_result.data:
         return []
 
-    # Batch fetch all related data
-    
-    # Extract IDs for batch queries
+    # Get benefits for all of the user's cards (cached, or one batched query)
     card_ids = [row["cards"]["id"] for row in user_cards_result.data]
-    user_card_ids = [row["id"] for row in user_cards_result.data]
-
-    # Fetch all benefits for these cards
-    all_benefits_result = supabase.table("benefits").select("*").in_("card_id", card_ids).execute()
-    
-    # Fetch all redemptions for these user cards
-    all_redemptions_result = supabase.table("benefit_redemptions").select("*").in_("user_card_id", user_card_ids).execute()
-    
-    # Fetch all preferences for these user cards
-    all_prefs_result = supabase.table("user_benefit_preferences").select("*").in_("user_card_id", user_card_ids).execute()
+    benefit_rows_by_card = await benefits_loader.load_many(card_ids)
 
     # Organize data for lookups
-    benefits_by_card_id: dict[str, list[dict]] = {}
-    for b in all_benefits_result.data:
-        cid = b["card_id"]
-        if cid not in benefits_by_card_id:
-            benefits_by_card_id[cid] = []
-        benefits_by_card_id[cid].append(b)
-
-    redemptions_lookup: dict[str, list[dict]] = {}
-    for r in all_redemptions_result.data:
-        key = f"{r['user_card_id']}_{r['benefit_id']}"
-        if key not in redemptions_lookup:
-            redemptions_lookup[key] = []
-        redemptions_lookup[key].append(r)
-
-    prefs_lookup: dict[str, dict] = {}
-    for p in all_prefs_result.data:
-        key = f"{p['user_card_id']}_{p['benefit_id']}"
-        prefs_lookup[key] = p
-
-    available = []
+    benefits_by_card_id = dict(zip(card_ids, benefit_rows_by_card))
+
+    redemptions_by_period = _redemptions_by_period(
+        r for uc_row in user_cards_result.data for r in uc_row["benefit_redemptions"]
+    )
+
+    prefs_lookup: dict[tuple[str, str], dict] = {}
+    for uc_row in user_cards_result.data:
+        for p in uc_row["user_benefit_preferences"]:
+            key = (p["user_card_id"], p["benefit_id"])
+            prefs_lookup[key] = p
+
+    # (sort key, benefit) pairs; keys are built once here rather than by a sort callback
+    keyed: list[tuple[tuple[date, Decimal], AvailableBenefit]] = []
     for uc_row in user_cards_result.data:
         card = _parse_card(uc_row["cards"])
         user_card = _parse_user_card(uc_row, card)
@@ -417,10 +589,10 @@ async def list_available_benefits(
         
         for b_row in card_benefits:
             benefit = _parse_benefit(b_row)
-            period = _calculate_current_period(benefit.schedule, user_card.card_open_date)
+            period = _calculate_current_period(benefit.schedule, user_card.card_open_date, today)
             
             # Get preferences from local lookup
-            pref_key = f"{user_card.id}_{benefit.id}"
+            pref_key = (user_card.id, benefit.id)
             pref = prefs_lookup.get(pref_key, {})
             auto_redeem = pref.get("auto_redeem", False)
             hidden = pref.get("hidden", False)
@@ -429,30 +601,9 @@ async def list_available_benefits(
             if hidden and not show_hidden:
                 continue
             
-            # Get redemptions from local lookup
-            redemptions_key = f"{user_card.id}_{benefit.id}"
-            benefit_redemptions = redemptions_lookup.get(redemptions_key, [])
-            
             # Calculate amount redeemed in current period
-            amount_redeemed = Decimal("0")
-            for r in benefit_redemptions:
-                # Check if this redemption is for the current period
-                is_current_period = False
-                if benefit.schedule == BenefitSchedule.one_time:
-                    is_current_period = True
-                elif r["period_year"] == period[0]:
-                    if period[1] is not None and r.get("period_month") == period[1]:
-                        is_current_period = True
-                    elif period[2] is not None and r.get("period_quarter") == period[2]:
-                        is_current_period = True
-                    elif period[3] is not None and r.get("period_half") == period[3]:
-                        is_current_period = True
-                    elif period[1] is None and period[2] is None and period[3] is None:
-                        is_current_period = True
-                
-                if is_current_period:
-                    amount_redeemed = Decimal(str(r.get("amount_redeemed", 0)))
-                    break
+            current = redemptions_by_period.get((user_card.id, benefit.id, *period))
+            amount_redeemed = _decimal(str(current.get("amount_redeemed", 0))) if current else Decimal("0")
             
             # Calculate remaining amount
             amount_remaining = benefit.value - amount_redeemed
@@ -466,21 +617,26 @@ async def list_available_benefits(
             is_fully_redeemed = amount_remaining <= 0
             
             if not is_fully_redeemed:
-                available.append(AvailableBenefit(
+                resets_at = _calculate_reset_date(benefit.schedule, user_card.card_open_date, today)
+                # Parts are already-validated models, so skip revalidating them
+                keyed.append(((resets_at or date.max, -benefit.value), AvailableBenefit.model_construct(
                     benefit=benefit,
                     user_card=user_card,
                     is_redeemed=False,
-                    resets_at=_calculate_reset_date(benefit.schedule, user_card.card_open_date),
+                    resets_at=resets_at,
                     auto_redeem=auto_redeem,
                     hidden=hidden,
                     amount_redeemed=amount_redeemed,
                     amount_remaining=amount_remaining,
-                ))
+                )))
     
     # Sort by reset date (soonest first), then by value (highest first)
-    available.sort(key=lambda x: (x.resets_at or date.max, -x.benefit.value))
+    keyed.sort(key=itemgetter(0))
+    available = [ab for _, ab in keyed]
     
-    return available
+    entry = _cache_entry(_AVAILABLE_BENEFITS_ADAPTER.dump_json(available))
+    catalog_cache.set(cache_key, entry, ttl_seconds=_USER_VIEW_TTL, tags=_user_view_tags(current_user.id, card_ids))
+    return _json_response(request, entry, cache_hit=False)
 
 
 # ============================================================
@@ -491,36 +647,45 @@ async def list_available_benefits(
 async def get_card_summary(
     user_card_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
+    benefits_loader: Annotated[BatchLoader[str, list[dict]], Depends(get_benefits_loader)],
     year: int = Query(default_factory=lambda: _today_eastern().year),
 ):
     """Get yearly summary stats for a user's card."""
-    # Get user card with card details
-    uc_result = supabase.table("user_cards").select("*, cards(*)").eq("id", user_card_id).eq("user_id", current_user.id).execute()
-    if not uc_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in your profile")
+    cache_key = f"user:{current_user.id}:summary:{user_card_id}:{year}"
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # The year's per-benefit redemption totals only need the id, so fetch
+    # them while the ownership check below runs
+    totals_task = asyncio.create_task(
+        supabase.rpc("redemption_totals", {"p_user_card_ids": [user_card_id], "p_year": year}).execute()
+    )
     
-    uc_row = uc_result.data[0]
+    # Get user card with card details
+    try:
+        uc_row = await fetch_one(
+            supabase.table("user_cards").select("*, cards(*)").eq("id", user_card_id).eq("user_id", current_user.id).single(),
+            "Card not found in your profile",
+        )
+    except BaseException:
+        # Including a cancelled request, so the RPC doesn't outlive it
+        totals_task.cancel()
+        raise
     card = _parse_card(uc_row["cards"])
     user_card = _parse_user_card(uc_row, card)
     
-    # Get benefits
-    benefits_result = supabase.table("benefits").select("*").eq("card_id", card.id).execute()
-    
-    # Get redemptions for the year
-    redemptions_result = supabase.table("benefit_redemptions").select("*").eq("user_card_id", user_card_id).eq("period_year", year).execute()
+    # Benefits usually come straight from the catalog cache
+    benefit_rows, totals_result = await asyncio.gather(benefits_loader.load(card.id), totals_task)
     
-    # Count redemptions per benefit
-    redemption_counts: dict[str, int] = {}
-    for r in redemptions_result.data:
-        bid = r["benefit_id"]
-        redemption_counts[bid] = redemption_counts.get(bid, 0) + 1
+    redemption_counts = {t["benefit_id"]: t["redemption_count"] for t in totals_result.data}
     
     benefit_summaries = []
     total_redeemed = Decimal("0")
     total_available = Decimal("0")
     
-    for b_row in benefits_result.data:
+    for b_row in benefit_rows:
         benefit = _parse_benefit(b_row)
         total_count = _get_total_count_for_year(benefit.schedule)
         redeemed_count = redemption_counts.get(benefit.id, 0)
@@ -531,7 +696,7 @@ async def get_card_summary(
         total_redeemed += redeemed_value
         total_available += total_value
         
-        benefit_summaries.append(BenefitSummary(
+        benefit_summaries.append(BenefitSummary.model_construct(
             benefit=benefit,
             redeemed_count=redeemed_count,
             total_count=total_count,
@@ -539,24 +704,33 @@ async def get_card_summary(
             total_value=total_value,
         ))
     
-    return CardSummary(
+    summary = CardSummary.model_construct(
         user_card=user_card,
         year=year,
         benefits=benefit_summaries,
         total_redeemed=total_redeemed,
         total_available=total_available,
     )
+    catalog_cache.set(cache_key, summary, ttl_seconds=_USER_VIEW_TTL, tags=_user_view_tags(current_user.id, [card.id]))
+    return summary
 
 
 @router.get("/user/summary/annual", response_model=AnnualSummary)
 async def get_annual_summary(
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
+    benefits_loader: Annotated[BatchLoader[str, list[dict]], Depends(get_benefits_loader)],
+    preferences_loader: Annotated[BatchLoader[str, list[dict]], Depends(get_preferences_loader)],
     year: int = Query(default_factory=lambda: _today_eastern().year),
 ):
     """Get annual summary across all user's cards (calendar year focus)."""
+    cache_key = f"user:{current_user.id}:annual:{year}"
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     # Get all user's cards
-    user_cards_result = supabase.table("user_cards").select("*, cards(*)").eq("user_id", current_user.id).execute()
+    user_cards_result = await supabase.table("user_cards").select("*, cards(*)").eq("user_id", current_user.id).execute()
 
     if not user_cards_result.data:
         return AnnualSummary(
@@ -573,34 +747,27 @@ async def get_annual_summary(
     card_ids = [row["cards"]["id"] for row in user_cards_result.data]
     user_card_ids = [row["id"] for row in user_cards_result.data]
 
-    # Batch fetch all benefits for these cards (1 query instead of N)
-    all_benefits_result = supabase.table("benefits").select("*").in_("card_id", card_ids).execute()
+    # Batch fetch benefits, the year's redemption totals (summed in the
+    # database) and preferences concurrently (1 query each instead of N)
+    benefit_rows_by_card, all_totals_result, pref_rows_by_user_card = await asyncio.gather(
+        benefits_loader.load_many(card_ids),
+        supabase.rpc("redemption_totals", {"p_user_card_ids": user_card_ids, "p_year": year}).execute(),
+        preferences_loader.load_many(user_card_ids),
+    )
 
-    # Batch fetch all redemptions for these user cards for the year (1 query instead of N)
-    all_redemptions_result = supabase.table("benefit_redemptions").select("*").in_("user_card_id", user_card_ids).eq("period_year", year).execute()
+    # Organize data for lookups
+    benefits_by_card_id = dict(zip(card_ids, benefit_rows_by_card))
 
-    # Batch fetch all preferences for these user cards (1 query instead of N)
-    all_prefs_result = supabase.table("user_benefit_preferences").select("*").in_("user_card_id", user_card_ids).execute()
+    totals_lookup: dict[tuple[str, str], dict] = {}
+    for t in all_totals_result.data:
+        key = (t["user_card_id"], t["benefit_id"])
+        totals_lookup[key] = t
 
-    # Organize data for lookups
-    benefits_by_card_id: dict[str, list[dict]] = {}
-    for b in all_benefits_result.data:
-        cid = b["card_id"]
-        if cid not in benefits_by_card_id:
-            benefits_by_card_id[cid] = []
-        benefits_by_card_id[cid].append(b)
-
-    redemptions_by_user_card: dict[str, list[dict]] = {}
-    for r in all_redemptions_result.data:
-        ucid = r["user_card_id"]
-        if ucid not in redemptions_by_user_card:
-            redemptions_by_user_card[ucid] = []
-        redemptions_by_user_card[ucid].append(r)
-
-    prefs_lookup: dict[str, dict] = {}
-    for p in all_prefs_result.data:
-        key = f"{p['user_card_id']}_{p['benefit_id']}"
-        prefs_lookup[key] = p
+    prefs_lookup: dict[tuple[str, str], dict] = {}
+    for pref_rows in pref_rows_by_user_card:
+        for p in pref_rows:
+            key = (p["user_card_id"], p["benefit_id"])
+            prefs_lookup[key] = p
 
     total_redeemed = Decimal("0")
     total_available = Decimal("0")
@@ -616,24 +783,12 @@ async def get_annual_summary(
         # Get benefits from local lookup
         card_benefits = benefits_by_card_id.get(card.id, [])
         
-        # Get redemptions from local lookup
-        card_redemptions = redemptions_by_user_card.get(user_card.id, [])
-        
-        # Build redemption amounts/counts from local data
-        redemption_amounts: dict[str, Decimal] = {}
-        redemption_counts: dict[str, int] = {}
-        for r in card_redemptions:
-            bid = r["benefit_id"]
-            amount = Decimal(str(r.get("amount_redeemed", 0)))
-            redemption_amounts[bid] = redemption_amounts.get(bid, Decimal("0")) + amount
-            redemption_counts[bid] = redemption_counts.get(bid, 0) + 1
-        
         for b_row in card_benefits:
             benefit = _parse_benefit(b_row)
             yearly_count = _get_total_count_for_year(benefit.schedule)
             
             # Check if auto-redeem is enabled for this benefit
-            pref_key = f"{user_card.id}_{benefit.id}"
+            pref_key = (user_card.id, benefit.id)
             pref = prefs_lookup.get(pref_key, {})
             auto_redeem = pref.get("auto_redeem", False)
             hidden = pref.get("hidden", False)
@@ -646,7 +801,8 @@ async def get_annual_summary(
             benefit_total_value = benefit.value * yearly_count
             
             # Get actual redeemed amount (sum of all partial redemptions)
-            benefit_redeemed_value = redemption_amounts.get(benefit.id, Decimal("0"))
+            totals = totals_lookup.get((user_card.id, benefit.id))
+            benefit_redeemed_value = _decimal(str(totals["amount_redeemed"])) if totals else Decimal("0")
             
             # If auto-redeem, count full value as redeemed
             if auto_redeem:
@@ -660,10 +816,10 @@ async def get_annual_summary(
             if auto_redeem:
                 redeemed_count += yearly_count
             else:
-                redeemed_count += redemption_counts.get(benefit.id, 0)
+                redeemed_count += totals["redemption_count"] if totals else 0
             total_count += yearly_count
 
-    return AnnualSummary(
+    summary = AnnualSummary(
         year=year,
         total_redeemed=total_redeemed,
         total_available=total_available,
@@ -672,6 +828,8 @@ async def get_annual_summary(
         total_count=total_count,
         total_annual_fees=total_annual_fees,
     )
+    catalog_cache.set(cache_key, summary, ttl_seconds=_USER_VIEW_TTL, tags=_user_view_tags(current_user.id, card_ids))
+    return summary
 
 
 # ============================================================
@@ -683,72 +841,83 @@ async def redeem_benefit(
     user_card_id: str,
     benefit_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
     request: BenefitRedemptionCreate = BenefitRedemptionCreate(),
 ):
     """Mark a benefit as redeemed (partial or full) for the current period."""
-    # Verify ownership
-    uc_result = supabase.table("user_cards").select("*").eq("id", user_card_id).eq("user_id", current_user.id).execute()
-    if not uc_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in your profile")
-    
-    user_card_row = uc_result.data[0]
-    card_open_date = date.fromisoformat(user_card_row["card_open_date"]) if isinstance(user_card_row["card_open_date"], str) else user_card_row["card_open_date"]
-    
-    # Verify benefit exists and belongs to the card
-    benefit_result = supabase.table("benefits").select("*").eq("id", benefit_id).eq("card_id", user_card_row["card_id"]).execute()
-    if not benefit_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Benefit not found for this card")
+    # Verify ownership and that the benefit belongs to the card
+    user_card_row, benefit_row = await _fetch_user_card_benefit(supabase, user_card_id, current_user.id, benefit_id)
+    card_open_date = user_card_row["card_open_date"]
+    benefit = _parse_benefit(benefit_row)
+    today = _today_eastern()
+    period = _calculate_current_period(benefit.schedule, card_open_date, today)
     
-    benefit = _parse_benefit(benefit_result.data[0])
-    period = _calculate_current_period(benefit.schedule, card_open_date)
+    # Most redemptions are the first in their period, so insert straight away;
+    # the period's unique index rejects the insert when a redemption exists
+    redemption_row = {
+        "user_card_id": user_card_id,
+        "benefit_id": benefit_id,
+        "period_year": period[0],
+        "period_month": period[1],
+        "period_quarter": period[2],
+        "period_half": period[3],
+    }
+    first_amount = request.amount if request.amount is not None else benefit.value
+    result = None
+    if 0 < first_amount <= benefit.value:
+        try:
+            result = await supabase.table("benefit_redemptions").insert({
+                **redemption_row,
+                "amount_redeemed": float(first_amount),
+            }).execute()
+        except APIError as e:
+            if e.code != "23505":  # unique_violation
+                raise
     
-    # Check for existing redemption in this period
-    existing_query = supabase.table("benefit_redemptions").select("*").eq("user_card_id", user_card_id).eq("benefit_id", benefit_id).eq("period_year", period[0])
+    if result is None:
+        # Check for existing redemption in this period
+        existing_query = supabase.table("benefit_redemptions").select("id, amount_redeemed").eq("user_card_id", user_card_id).eq("benefit_id", benefit_id).eq("period_year", period[0])
+        
+        if period[1] is not None:
+            existing_query = existing_query.eq("period_month", period[1])
+        if period[2] is not None:
+            existing_query = existing_query.eq("period_quarter", period[2])
+        if period[3] is not None:
+            existing_query = existing_query.eq("period_half", period[3])
+        
+        existing = await existing_query.execute()
+        
+        # Calculate current amount redeemed and remaining
+        current_amount_redeemed = Decimal("0")
+        if existing.data:
+            current_amount_redeemed = _decimal(str(existing.data[0].get("amount_redeemed", 0)))
+        
+        amount_remaining = benefit.value - current_amount_redeemed
+        
+        # Determine amount to redeem (default to full remaining)
+        redeem_amount = request.amount if request.amount is not None else amount_remaining
+        
+        # Validate amount
+        if redeem_amount <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Amount must be greater than 0")
+        if redeem_amount > amount_remaining:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Amount exceeds remaining value (${amount_remaining})")
+        
+        new_total = current_amount_redeemed + redeem_amount
+        
+        if existing.data:
+            # Update existing redemption with new total
+            result = await supabase.table("benefit_redemptions").update({
+                "amount_redeemed": float(new_total),
+            }).eq("id", existing.data[0]["id"]).execute()
+        else:
+            # Create new redemption
+            result = await supabase.table("benefit_redemptions").insert({
+                **redemption_row,
+                "amount_redeemed": float(redeem_amount),
+            }).execute()
     
-    if period[1] is not None:
-        existing_query = existing_query.eq("period_month", period[1])
-    if period[2] is not None:
-        existing_query = existing_query.eq("period_quarter", period[2])
-    if period[3] is not None:
-        existing_query = existing_query.eq("period_half", period[3])
-    
-    existing = existing_query.execute()
-    
-    # Calculate current amount redeemed and remaining
-    current_amount_redeemed = Decimal("0")
-    if existing.data:
-        current_amount_redeemed = Decimal(str(existing.data[0].get("amount_redeemed", 0)))
-    
-    amount_remaining = benefit.value - current_amount_redeemed
-    
-    # Determine amount to redeem (default to full remaining)
-    redeem_amount = request.amount if request.amount is not None else amount_remaining
-    
-    # Validate amount
-    if redeem_amount <= 0:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Amount must be greater than 0")
-    if redeem_amount > amount_remaining:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Amount exceeds remaining value (${amount_remaining})")
-    
-    new_total = current_amount_redeemed + redeem_amount
-    
-    if existing.data:
-        # Update existing redemption with new total
-        result = supabase.table("benefit_redemptions").update({
-            "amount_redeemed": float(new_total),
-        }).eq("id", existing.data[0]["id"]).execute()
-    else:
-        # Create new redemption
-        result = supabase.table("benefit_redemptions").insert({
-            "user_card_id": user_card_id,
-            "benefit_id": benefit_id,
-            "period_year": period[0],
-            "period_month": period[1],
-            "period_quarter": period[2],
-            "period_half": period[3],
-            "amount_redeemed": float(redeem_amount),
-        }).execute()
+    _invalidate_user_views(current_user.id)
     
     row = result.data[0]
     return BenefitRedemption(
@@ -756,7 +925,7 @@ async def redeem_benefit(
         user_card_id=row["user_card_id"],
         benefit_id=row["benefit_id"],
         redeemed_at=row["redeemed_at"],
-        amount_redeemed=Decimal(str(row["amount_redeemed"])),
+        amount_redeemed=_decimal(str(row["amount_redeemed"])),
         period_year=row["period_year"],
         period_month=row.get("period_month"),
         period_quarter=row.get("period_quarter"),
@@ -769,24 +938,15 @@ async def unredeem_benefit(
     user_card_id: str,
     benefit_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Unmark a benefit redemption for the current period."""
-    # Verify ownership
-    uc_result = supabase.table("user_cards").select("*").eq("id", user_card_id).eq("user_id", current_user.id).execute()
-    if not uc_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in your profile")
-    
-    user_card_row = uc_result.data[0]
-    card_open_date = date.fromisoformat(user_card_row["card_open_date"]) if isinstance(user_card_row["card_open_date"], str) else user_card_row["card_open_date"]
-    
-    # Get benefit for schedule
-    benefit_result = supabase.table("benefits").select("*").eq("id", benefit_id).execute()
-    if not benefit_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Benefit not found")
-    
-    benefit = _parse_benefit(benefit_result.data[0])
-    period = _calculate_current_period(benefit.schedule, card_open_date)
+    # Verify ownership and get the benefit for its schedule
+    user_card_row, benefit_row = await _fetch_user_card_benefit(supabase, user_card_id, current_user.id, benefit_id)
+    card_open_date = user_card_row["card_open_date"]
+    benefit = _parse_benefit(benefit_row)
+    today = _today_eastern()
+    period = _calculate_current_period(benefit.schedule, card_open_date, today)
     
     # Find and delete redemption
     delete_query = supabase.table("benefit_redemptions").delete().eq("user_card_id", user_card_id).eq("benefit_id", benefit_id).eq("period_year", period[0])
@@ -798,7 +958,8 @@ async def unredeem_benefit(
     if period[3] is not None:
         delete_query = delete_query.eq("period_half", period[3])
     
-    delete_query.execute()
+    await delete_query.execute()
+    _invalidate_user_views(current_user.id)
 
 
 # ============================================================
@@ -810,21 +971,19 @@ async def get_benefit_preferences(
     user_card_id: str,
     benefit_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Get user preferences for a specific benefit."""
-    # Verify ownership
-    uc_result = supabase.table("user_cards").select("id").eq("id", user_card_id).eq("user_id", current_user.id).execute()
-    if not uc_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in your profile")
-    
-    # Get existing preference or return defaults
-    pref_result = supabase.table("user_benefit_preferences").select("*").eq(
-        "user_card_id", user_card_id
-    ).eq("benefit_id", benefit_id).execute()
+    # Verify ownership and get the existing preference, if any, in one query
+    uc_row = await fetch_one(
+        supabase.table("user_cards").select("id, user_benefit_preferences(*)")
+        .eq("id", user_card_id).eq("user_id", current_user.id)
+        .eq("user_benefit_preferences.benefit_id", benefit_id).single(),
+        "Card not found in your profile",
+    )
     
-    if pref_result.data:
-        row = pref_result.data[0]
+    if uc_row["user_benefit_preferences"]:
+        row = uc_row["user_benefit_preferences"][0]
         return BenefitPreference(
             id=row["id"],
             user_card_id=row["user_card_id"],
@@ -851,24 +1010,11 @@ async def update_benefit_preferences(
     benefit_id: str,
     request: BenefitPreferenceUpdate,
     current_user: Annotated[User, Depends(get_current_user)],
-    supabase: Annotated[Client, Depends(get_supabase_admin_client)],
+    supabase: Annotated[AsyncClient, Depends(get_supabase_admin_client)],
 ):
     """Update user preferences for a specific benefit (auto-redeem, hidden)."""
-    # Verify ownership
-    uc_result = supabase.table("user_cards").select("id, card_id").eq("id", user_card_id).eq("user_id", current_user.id).execute()
-    if not uc_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found in your profile")
-    
-    # Verify benefit belongs to the card
-    card_id = uc_result.data[0]["card_id"]
-    benefit_result = supabase.table("benefits").select("id").eq("id", benefit_id).eq("card_id", card_id).execute()
-    if not benefit_result.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Benefit not found for this card")
-    
-    # Check if preference already exists
-    existing = supabase.table("user_benefit_preferences").select("*").eq(
-        "user_card_id", user_card_id
-    ).eq("benefit_id", benefit_id).execute()
+    # Verify ownership and that the benefit belongs to the card
+    await _fetch_user_card_benefit(supabase, user_card_id, current_user.id, benefit_id)
     
     # Build update data (only include non-None fields)
     update_data = {}
@@ -877,19 +1023,15 @@ async def update_benefit_preferences(
     if request.hidden is not None:
         update_data["hidden"] = request.hidden
     
-    if existing.data:
-        # Update existing preference
-        result = supabase.table("user_benefit_preferences").update(update_data).eq(
-            "id", existing.data[0]["id"]
-        ).execute()
-    else:
-        # Create new preference
-        insert_data = {
-            "user_card_id": user_card_id,
-            "benefit_id": benefit_id,
-            **update_data,
-        }
-        result = supabase.table("user_benefit_preferences").insert(insert_data).execute()
+    # Create or update the preference in one statement; fields left out keep
+    # their current (or default) values
+    result = await supabase.table("user_benefit_preferences").upsert({
+        "user_card_id": user_card_id,
+        "benefit_id": benefit_id,
+        **update_data,
+    }, on_conflict="user_card_id,benefit_id").execute()
+    
+    _invalidate_user_views(current_user.id)
     
     row = result.data[0]
     return BenefitPreference(
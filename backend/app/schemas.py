@@ -3,7 +3,7 @@
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_serializer
 
 
 # Auth Request Models
@@ -90,6 +90,10 @@ class CardUpdate(BaseModel):
     image_url: str | None = None
     annual_fee: Decimal | None = None
 
+    @field_serializer("annual_fee")
+    def _serialize_annual_fee(self, value: Decimal) -> float:
+        return float(value)
+
 
 class Card(CardBase):
     """Card response model."""
@@ -120,6 +124,14 @@ class BenefitUpdate(BaseModel):
     value: Decimal | None = None
     schedule: BenefitSchedule | None = None
 
+    @field_serializer("value")
+    def _serialize_value(self, value: Decimal) -> float:
+        return float(value)
+
+    @field_serializer("schedule")
+    def _serialize_schedule(self, value: BenefitSchedule) -> str:
+        return value.value
+
 
 class Benefit(BenefitBase):
     """Benefit response model."""
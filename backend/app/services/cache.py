@@ -1,45 +1,87 @@
 """Simple in-memory cache for catalog data."""
 
-from typing import Any, Dict, Optional, TypeVar, Generic
-from datetime import datetime, timedelta
+import asyncio
+import time
+import weakref
+from typing import Any, Dict, Iterable, Optional, Set, TypeVar, Generic
+from cachetools import TLRUCache
 
 T = TypeVar("T")
 
 class CacheEntry(Generic[T]):
     def __init__(self, data: T, ttl_seconds: int = 300):
         self.data = data
-        self.expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+        # Monotonic deadline: cheap to read and unaffected by wall-clock changes
+        self.expires_at = time.monotonic() + ttl_seconds
 
     @property
     def is_expired(self) -> bool:
-        return datetime.now() > self.expires_at
+        return time.monotonic() > self.expires_at
+
+def _entry_deadline(key: str, entry: CacheEntry, now: float) -> float:
+    return entry.expires_at
 
 class MemoryCache:
-    def __init__(self):
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(self, maxsize: int = 1024):
+        # Bounded: expired entries are purged on write and the least recently
+        # used entry is evicted once full. Each entry keeps its own TTL.
+        self._cache: "TLRUCache[str, CacheEntry]" = TLRUCache(
+            maxsize=maxsize, ttu=_entry_deadline, timer=time.monotonic
+        )
+        self._tags: Dict[str, Set[str]] = {}
+        # Tag memberships recorded since the tag index was last pruned
+        self._tag_writes = 0
+        # Locks live only while some request holds or waits on them
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
 
     def get(self, key: str) -> Optional[Any]:
+        # Expired entries read as missing
         entry = self._cache.get(key)
-        if not entry:
-            return None
-        
-        if entry.is_expired:
-            del self._cache[key]
+        if entry is None:
             return None
-            
         return entry.data
 
-    def set(self, key: str, data: Any, ttl_seconds: int = 300):
+    def set(self, key: str, data: Any, ttl_seconds: int = 300, tags: Iterable[str] = ()):
         self._cache[key] = CacheEntry(data, ttl_seconds)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+            self._tag_writes += 1
+        if self._tag_writes > 4 * self._cache.maxsize:
+            self._prune_tags()
+
+    def _prune_tags(self):
+        """Drop tag memberships of keys that have expired or been evicted."""
+        live = set(self._cache.keys())
+        self._tags = {tag: kept for tag, keys in self._tags.items() if (kept := keys & live)}
+        self._tag_writes = 0
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """
+        Get the lock guarding a rebuild of `key`.
+
+        Hold it while fetching a missing entry and re-check the cache once
+        acquired, so concurrent misses wait for a single fetch.
+        """
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
 
     def invalidate(self, key_prefix: str):
         """Invalidate all keys starting with the prefix."""
         keys_to_delete = [k for k in self._cache.keys() if k.startswith(key_prefix)]
         for k in keys_to_delete:
-            del self._cache[k]
+            self._cache.pop(k, None)
+
+    def invalidate_tag(self, tag: str):
+        """Invalidate all keys stored with the tag."""
+        for k in self._tags.pop(tag, ()):
+            self._cache.pop(k, None)
 
     def clear(self):
         self._cache.clear()
+        self._tags.clear()
+        self._tag_writes = 0
 
 # Global cache instance
 catalog_cache = MemoryCache()
@@ -0,0 +1,107 @@
+"""Batching loaders that coalesce per-key lookups into a single query."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Set, TypeVar
+
+from supabase import AsyncClient
+
+from .cache import catalog_cache
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Collect `load()` calls made before the event loop next runs and resolve
+    them all with a single call to `batch_fn`.
+
+    `batch_fn` receives the distinct keys and returns a dict with a value for
+    each of them. Repeated keys within a batch share one result. Nothing is
+    kept after a batch resolves, so one loader can be shared by concurrent
+    requests. Each caller gets its own future, so a cancelled request doesn't
+    cancel the load for others waiting on the same key.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]]):
+        self._batch_fn = batch_fn
+        self._pending: Dict[K, asyncio.Future] = {}
+        # Strong references to in-flight dispatches until they finish
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+
+    def load(self, key: K) -> "asyncio.Future[V]":
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                # Runs once the caller yields, after this tick's loads are queued
+                task = loop.create_task(self._dispatch())
+                self._dispatch_tasks.add(task)
+                task.add_done_callback(self._dispatch_tasks.discard)
+            future = self._pending[key] = loop.create_future()
+        return asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> List[V]:
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    async def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        try:
+            results = await self._batch_fn(list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Callers read it through their shields; if they have all been
+                    # cancelled, don't log it as never retrieved
+                    future.exception()
+            return
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(results[key])
+
+
+def create_benefits_by_card_loader(supabase: AsyncClient) -> BatchLoader[str, List[dict]]:
+    """
+    Loader for benefit rows by card_id.
+
+    Rows are served from the catalog cache where present; the cards missing
+    from it are fetched with one IN query per batch and cached per card,
+    tagged with the card so admin edits drop them.
+    """
+
+    async def batch_fn(card_ids: List[str]) -> Dict[str, List[dict]]:
+        rows_by_card: Dict[str, List[dict]] = {}
+        missing: List[str] = []
+        for card_id in card_ids:
+            rows = catalog_cache.get(f"benefits:card:{card_id}")
+            if rows is None:
+                missing.append(card_id)
+            else:
+                rows_by_card[card_id] = rows
+        if missing:
+            result = await supabase.table("benefits").select("*").in_("card_id", missing).execute()
+            fetched: Dict[str, List[dict]] = {card_id: [] for card_id in missing}
+            for row in result.data:
+                fetched[row["card_id"]].append(row)
+            for card_id, rows in fetched.items():
+                catalog_cache.set(f"benefits:card:{card_id}", rows, tags=[f"card:{card_id}"])
+            rows_by_card.update(fetched)
+        return rows_by_card
+
+    return BatchLoader(batch_fn)
+
+
+def create_preferences_by_user_card_loader(supabase: AsyncClient) -> BatchLoader[str, List[dict]]:
+    """Loader for benefit preference rows by user_card_id, fetched with one IN query per batch."""
+
+    async def batch_fn(user_card_ids: List[str]) -> Dict[str, List[dict]]:
+        result = await supabase.table("user_benefit_preferences").select(
+            "user_card_id, benefit_id, auto_redeem, hidden"
+        ).in_("user_card_id", user_card_ids).execute()
+        rows_by_user_card: Dict[str, List[dict]] = {ucid: [] for ucid in user_card_ids}
+        for row in result.data:
+            rows_by_user_card[row["user_card_id"]].append(row)
+        return rows_by_user_card
+
+    return BatchLoader(batch_fn)
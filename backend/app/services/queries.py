@@ -0,0 +1,17 @@
+"""Helpers for PostgREST queries shared by the routers."""
+
+from fastapi import HTTPException, status
+from postgrest.exceptions import APIError
+
+# PostgREST error for a singular response that matched no row (or several)
+_NOT_SINGLE_ROW = "PGRST116"
+
+
+async def fetch_one(query, not_found: str) -> dict:
+    """Execute a `.single()` query and return its row, raising 404 when nothing matched."""
+    try:
+        return (await query.execute()).data
+    except APIError as e:
+        if e.code == _NOT_SINGLE_ROW:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found) from e
+        raise
@@ -0,0 +1,21 @@
+-- Migration: Add cards_with_counts view for the catalog listing
+-- Run this in Supabase SQL Editor
+
+-- Cards with the number of benefits attached, aggregated in the database
+-- so the catalog endpoint doesn't have to fetch every benefit row.
+-- security_invoker makes the view respect the caller's RLS policies.
+-- Note: c.* is expanded when the view is created, so recreate the view
+-- after adding columns to cards.
+CREATE OR REPLACE VIEW cards_with_counts
+WITH (security_invoker = true) AS
+SELECT
+    c.*,
+    COALESCE(b.benefits_count, 0) AS benefits_count
+FROM cards c
+LEFT JOIN (
+    SELECT card_id, COUNT(*)::INTEGER AS benefits_count
+    FROM benefits
+    GROUP BY card_id
+) b ON b.card_id = c.id;
+
+GRANT SELECT ON cards_with_counts TO authenticated, service_role;
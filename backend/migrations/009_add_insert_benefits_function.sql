@@ -0,0 +1,20 @@
+-- Migration: Add insert_benefits function for bulk benefit creation
+-- Run this in Supabase SQL Editor
+
+-- Insert a batch of benefits for one card in a single statement.
+-- p_rows is a JSON array of {name, description, value, schedule} objects.
+-- Raises foreign_key_violation (23503) if the card doesn't exist.
+CREATE OR REPLACE FUNCTION insert_benefits(p_card_id UUID, p_rows JSONB)
+RETURNS SETOF benefits
+LANGUAGE sql
+AS $$
+    INSERT INTO benefits (card_id, name, description, value, schedule)
+    SELECT p_card_id, r.name, r.description, r.value, r.schedule
+    FROM jsonb_to_recordset(p_rows)
+        AS r(name TEXT, description TEXT, value DECIMAL(10, 2), schedule benefit_schedule)
+    RETURNING *;
+$$;
+
+-- Catalog writes go through the backend's service role only
+REVOKE EXECUTE ON FUNCTION insert_benefits(UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION insert_benefits(UUID, JSONB) TO service_role;
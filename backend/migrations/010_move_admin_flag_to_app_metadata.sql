@@ -0,0 +1,11 @@
+-- Migration: Move is_admin from user_metadata to app_metadata
+-- Run this in Supabase SQL Editor
+
+-- user_metadata can be changed by the user themselves through the auth API,
+-- app_metadata only by the service role. Supabase already includes
+-- app_metadata in access tokens, so the backend reads the flag straight
+-- from the verified token claims.
+UPDATE auth.users
+SET raw_app_meta_data = COALESCE(raw_app_meta_data, '{}'::jsonb) || '{"is_admin": true}'::jsonb,
+    raw_user_meta_data = raw_user_meta_data - 'is_admin'
+WHERE raw_user_meta_data->>'is_admin' = 'true';
@@ -0,0 +1,15 @@
+-- Migration: Index redemptions by user card and period year
+-- Run this in Supabase SQL Editor
+
+-- The dashboard, user card and annual summary queries filter redemptions on
+-- user_card_id IN (...) together with period_year. The existing unique key
+-- (user_card_id, benefit_id, period_year, ...) can only use its leading
+-- column for that, so every redemption a card ever had gets read.
+CREATE INDEX IF NOT EXISTS idx_benefit_redemptions_user_card_period
+    ON benefit_redemptions(user_card_id, period_year);
+
+-- Covered by the new index's leading column
+DROP INDEX IF EXISTS idx_benefit_redemptions_user_card_id;
+
+-- Covered by UNIQUE(user_card_id, benefit_id)
+DROP INDEX IF EXISTS idx_user_benefit_preferences_user_card_id;
@@ -0,0 +1,30 @@
+-- Migration: Add redemption_totals function for the yearly summaries
+-- Run this in Supabase SQL Editor
+
+-- Per-benefit redemption totals for a set of user cards in one period year,
+-- aggregated in the database so the summaries don't fetch every redemption.
+-- Callers must pass only user card ids they have verified the user owns.
+CREATE OR REPLACE FUNCTION redemption_totals(p_user_card_ids UUID[], p_year INT)
+RETURNS TABLE (
+    user_card_id UUID,
+    benefit_id UUID,
+    amount_redeemed DECIMAL(12, 2),
+    redemption_count INTEGER
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        r.user_card_id,
+        r.benefit_id,
+        SUM(r.amount_redeemed)::DECIMAL(12, 2),
+        COUNT(*)::INTEGER
+    FROM benefit_redemptions r
+    WHERE r.user_card_id = ANY(p_user_card_ids)
+      AND r.period_year = p_year
+    GROUP BY r.user_card_id, r.benefit_id;
+$$;
+
+-- Totals are read through the backend's service role only
+REVOKE EXECUTE ON FUNCTION redemption_totals(UUID[], INT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION redemption_totals(UUID[], INT) TO service_role;
@@ -0,0 +1,55 @@
+-- Migration: Enforce one redemption row per benefit per period
+-- Run this in Supabase SQL Editor
+
+-- benefit_redemptions_period_unique never fired: every redemption leaves at
+-- least two of period_month/period_quarter/period_half NULL, and NULLs
+-- compare as distinct in a UNIQUE constraint. Concurrent redeems could
+-- therefore insert duplicate rows for the same period.
+
+-- 1. Merge any duplicates into the earliest row of each period.
+-- Each duplicate was checked against the full benefit value on its own, so
+-- their sum can exceed it. The merged amount is the sum capped at the
+-- benefit's value, and never less than the earliest row's own amount.
+WITH periods AS (
+    SELECT
+        id,
+        SUM(amount_redeemed) OVER period AS total_redeemed,
+        ROW_NUMBER() OVER (period ORDER BY created_at, id) AS position
+    FROM benefit_redemptions
+    WINDOW period AS (
+        PARTITION BY user_card_id, benefit_id, period_year,
+            COALESCE(period_month, 0), COALESCE(period_quarter, 0), COALESCE(period_half, 0)
+    )
+)
+UPDATE benefit_redemptions br
+SET amount_redeemed = GREATEST(br.amount_redeemed, LEAST(p.total_redeemed, b.value))
+FROM periods p, benefits b
+WHERE br.id = p.id
+  AND b.id = br.benefit_id
+  AND p.position = 1
+  AND br.amount_redeemed <> GREATEST(br.amount_redeemed, LEAST(p.total_redeemed, b.value));
+
+WITH periods AS (
+    SELECT
+        id,
+        ROW_NUMBER() OVER (
+            PARTITION BY user_card_id, benefit_id, period_year,
+                COALESCE(period_month, 0), COALESCE(period_quarter, 0), COALESCE(period_half, 0)
+            ORDER BY created_at, id
+        ) AS position
+    FROM benefit_redemptions
+)
+DELETE FROM benefit_redemptions br
+USING periods p
+WHERE br.id = p.id AND p.position > 1;
+
+-- 2. Unique per period with the unused period columns treated as equal.
+-- Its leading columns also serve the redeem endpoint's existing-row lookup.
+CREATE UNIQUE INDEX IF NOT EXISTS ux_benefit_redemptions_period
+    ON benefit_redemptions(
+        user_card_id, benefit_id, period_year,
+        COALESCE(period_month, 0), COALESCE(period_quarter, 0), COALESCE(period_half, 0)
+    );
+
+-- 3. Superseded by the index above
+ALTER TABLE benefit_redemptions DROP CONSTRAINT IF EXISTS benefit_redemptions_period_unique;